@@ -0,0 +1,154 @@
+import threading
+import numpy as np
+
+# Mono sample rate used for microphone capture; every analyzer only needs the speech band
+SPEECH_SAMPLE_RATE = 16000
+
+# The confidence thresholds were tuned on 44.1 kHz recordings framed with 2048/512-sample windows.
+# Frames are sized in seconds and ZCR is expressed per sample at this rate, so a 16 kHz capture
+# measures the same thing as the original recordings.
+CALIBRATION_SAMPLE_RATE = 44100
+FRAME_SECONDS = 2048 / CALIBRATION_SAMPLE_RATE
+HOP_SECONDS = 512 / CALIBRATION_SAMPLE_RATE
+
+# Function to get the (frame length, hop length) in samples at a sample rate
+def frame_lengths(samplerate):
+    return int(round(FRAME_SECONDS * samplerate)), int(round(HOP_SECONDS * samplerate))
+
+# Function to compute the zero-crossing rate of each frame, in crossings per sample at the calibration rate
+def zero_crossing_rate(frames, samplerate):
+    signs = np.signbit(frames)
+    crossings = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1)
+    return crossings / frames.shape[1] * (samplerate / CALIBRATION_SAMPLE_RATE)
+
+# Function to mix any (samples,) or (samples, channels) array down to mono float32 in [-1, 1]
+def to_mono_float(samples):
+    samples = np.asarray(samples)
+    if samples.dtype.kind == "i":
+        samples = samples.astype(np.float32) / float(np.iinfo(samples.dtype).max + 1)
+    if samples.ndim == 2:
+        samples = samples.mean(axis=1)
+    return samples.astype(np.float32, copy=False)
+
+# Decoded audio plus framewise features, computed once and shared by every analyzer
+class AudioFeatures:
+    def __init__(self, y, sr, frame_length=None, hop_length=None):
+        self.y = to_mono_float(y)
+        self.sr = sr
+        default_frame, default_hop = frame_lengths(sr)
+        self.frame_length = frame_length or default_frame
+        self.hop_length = hop_length or default_hop
+        self._frames = None
+        self._rms = None
+        self._zcr = None
+        self._energy = None
+
+    # Function to decode a WAV file exactly once at its native sample rate
+    @classmethod
+    def from_file(cls, audio_path, **kwargs):
+        import soundfile as sf
+        y, sr = sf.read(audio_path, dtype="float32", always_2d=True)
+        return cls(y, sr, **kwargs)
+
+    # Function to accept a path, an in-memory AudioCapture or an existing AudioFeatures object
+    @classmethod
+    def from_source(cls, audio):
+        if isinstance(audio, cls):
+            return audio
+        if isinstance(audio, AudioCapture):
+            return audio.features()
+        return cls.from_file(audio)
+
+    # Length of the decoded signal in seconds
+    @property
+    def duration(self):
+        return len(self.y) / self.sr
+
+    # Centered frames as a strided view of the padded signal (no copy per frame). The ends are padded
+    # by repeating the edge samples; librosa's rms pads with zeros, so the first and last frames differ slightly.
+    @property
+    def frames(self):
+        if self._frames is None:
+            padded = np.pad(self.y, self.frame_length // 2, mode="edge") if len(self.y) else np.zeros(self.frame_length, np.float32)
+            windows = np.lib.stride_tricks.sliding_window_view(padded, self.frame_length)
+            self._frames = windows[::self.hop_length]
+        return self._frames
+
+    # Root Mean Square energy per frame
+    @property
+    def rms(self):
+        if self._rms is None:
+            self._rms = np.sqrt(self.energy)
+        return self._rms
+
+    # Mean squared amplitude per frame
+    @property
+    def energy(self):
+        if self._energy is None:
+            frames = self.frames
+            self._energy = np.einsum("ij,ij->i", frames, frames) / self.frame_length
+        return self._energy
+
+    # Sign changes per sample at the calibration rate, per frame
+    @property
+    def zcr(self):
+        if self._zcr is None:
+            self._zcr = zero_crossing_rate(self.frames, self.sr)
+        return self._zcr
+
+
+# Recorded answer held in memory: a mono int16 view into the capture buffer
+class AudioCapture:
+    def __init__(self, samples, samplerate):
+        self.samples = samples
+        self.samplerate = samplerate
+        self._features = None
+
+    # Function to convert a speech_recognition AudioData into a mono 16-bit capture
+    @classmethod
+    def from_audio_data(cls, audio, samplerate=SPEECH_SAMPLE_RATE):
+        return cls(np.frombuffer(audio.get_raw_data(convert_rate=samplerate, convert_width=2), dtype=np.int16), samplerate)
+
+    # Length of the recording in seconds
+    @property
+    def duration(self):
+        return len(self.samples) / self.samplerate
+
+    # Function to get the shared audio features, converting the samples to float only once
+    def features(self):
+        if self._features is None:
+            self._features = AudioFeatures(self.samples, self.samplerate)
+        return self._features
+
+    # Function to persist the recording on a background thread, off the scoring path.
+    # The thread is not a daemon, so the interpreter waits for the write to finish at exit.
+    def save_async(self, path):
+        import soundfile as sf
+        thread = threading.Thread(target=sf.write, args=(path, self.samples, self.samplerate), kwargs={"subtype": "PCM_16"})
+        thread.start()
+        return thread
+
+
+# Function to turn energy and ZCR statistics into the 0-100 confidence score
+def confidence_from_stats(energy_mean, energy_max, zcr_mean):
+    # Normalize energy and ZCR mean
+    energy_scaled = (energy_mean / energy_max) if energy_max != 0 else energy_mean
+
+    # Dynamic confidence score scaling using energy and ZCR
+    confidence_score = min(max((energy_scaled + zcr_mean) * 100, 0), 100)
+    return round(float(confidence_score), 2)
+
+# Function to calculate the confidence score from cached frame features
+def confidence_from_features(features):
+    return confidence_from_stats(np.mean(features.rms), np.max(features.rms), np.mean(features.zcr))
+
+# Function to calculate the confidence score of a recording (path, AudioCapture or AudioFeatures); 0 if it cannot be read
+def calculate_confidence(audio):
+    try:
+        # Decode once and derive the score from the cached RMS/ZCR frames
+        features = AudioFeatures.from_source(audio)
+        return confidence_from_features(features)
+    
+    except Exception as e:
+        print(f"Error extracting confidence: {e}")
+        return 0
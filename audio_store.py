@@ -0,0 +1,161 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+import numpy as np
+from audio_features import AudioCapture
+
+try:
+    import psutil
+except ImportError:  # Without psutil only the size cap triggers spilling
+    psutil = None
+
+# Function to create an id for a new interview session
+def new_session_id():
+    return uuid.uuid4().hex
+
+# Recording that was moved to disk; it is memory-mapped back when read
+class SpilledAudio:
+    def __init__(self, path, samplerate, nbytes):
+        self.path = path
+        self.samplerate = samplerate
+        self.nbytes = nbytes
+
+# In-memory store of response audio keyed by (session id, question id), so concurrent
+# interviews never share a file. Least recently used recordings are spilled to disk when
+# the memory cap is reached or the machine is under memory pressure, and dropped when
+# the disk cap is reached. Sessions idle for longer than session_ttl seconds are dropped,
+# since a closed browser tab never says goodbye.
+class SessionAudioStore:
+    def __init__(self, max_memory_bytes=256 * 2**20, max_disk_bytes=2 * 2**30, spill_dir=None, memory_pressure_percent=90.0, session_ttl=None):
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.memory_pressure_percent = memory_pressure_percent
+        self.session_ttl = session_ttl
+        self.spill_dir = spill_dir  # Created on the first spill
+        self._entries = OrderedDict()
+        self._last_used = {}  # session id -> monotonic time of its last put or get
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+
+    # Function to store the recording of one answer
+    def put(self, session_id, question_id, capture):
+        key = (session_id, question_id)
+        # A view would keep its whole base buffer alive (the recorder preallocates max_duration),
+        # so the store keeps its own copy and the memory cap counts what is really held
+        if capture.samples.base is not None:
+            capture = AudioCapture(np.array(capture.samples, copy=True), capture.samplerate)
+        with self._lock:
+            self._expire_sessions()
+            self._remove(key)
+            self._entries[key] = capture
+            self._last_used[session_id] = time.monotonic()
+            self._memory_bytes += capture.samples.nbytes
+            self._enforce_limits(keep=key)
+
+    # Function to fetch a recording (memory-mapped if it was spilled), or None if it is gone
+    def get(self, session_id, question_id):
+        key = (session_id, question_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self._last_used[session_id] = time.monotonic()
+            if isinstance(entry, SpilledAudio):
+                return AudioCapture(np.load(entry.path, mmap_mode="r"), entry.samplerate)
+            return entry
+
+    # Function to forget every recording of a finished session
+    def drop_session(self, session_id):
+        with self._lock:
+            self._drop_session(session_id)
+
+    # Function to drop one session (caller holds the lock)
+    def _drop_session(self, session_id):
+        for key in [key for key in self._entries if key[0] == session_id]:
+            self._remove(key)
+        self._last_used.pop(session_id, None)
+
+    # Function to drop the sessions idle for longer than session_ttl (caller holds the lock)
+    def _expire_sessions(self):
+        if self.session_ttl is None:
+            return
+        cutoff = time.monotonic() - self.session_ttl
+        for session_id in [session_id for session_id, last_used in self._last_used.items() if last_used < cutoff]:
+            self._drop_session(session_id)
+
+    # Function to report how much audio is held in memory and on disk
+    def stats(self):
+        with self._lock:
+            spilled = sum(isinstance(entry, SpilledAudio) for entry in self._entries.values())
+            return {
+                "recordings": len(self._entries),
+                "spilled": spilled,
+                "memory_mb": round(self._memory_bytes / 2**20, 2),
+                "disk_mb": round(self._disk_bytes / 2**20, 2),
+            }
+
+    # Function to delete the store's spill directory
+    def close(self):
+        with self._lock:
+            self._entries.clear()
+            self._last_used.clear()
+            self._memory_bytes = self._disk_bytes = 0
+        if self.spill_dir:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+    # Function to drop one entry and its spill file (caller holds the lock)
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if isinstance(entry, SpilledAudio):
+            self._disk_bytes -= entry.nbytes
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+        elif entry is not None:
+            self._memory_bytes -= entry.samples.nbytes
+
+    # Function to check system-wide memory use
+    def _under_memory_pressure(self):
+        return psutil is not None and psutil.virtual_memory().percent >= self.memory_pressure_percent
+
+    # Function to apply the memory and disk caps (caller holds the lock). Memory pressure is checked
+    # once per call; under pressure the in-memory audio is halved instead of waiting for the cap.
+    # The recording in `keep` (the one just stored) stays in memory.
+    def _enforce_limits(self, keep=None):
+        target = self.max_memory_bytes
+        if self._under_memory_pressure():
+            target = min(target, self._memory_bytes // 2)
+
+        # Spill the least recently used in-memory recordings first
+        for key in list(self._entries):
+            if self._memory_bytes <= target:
+                break
+            entry = self._entries[key]
+            if key == keep or isinstance(entry, SpilledAudio):
+                continue
+            if self.spill_dir is None:
+                self.spill_dir = tempfile.mkdtemp(prefix="interview_audio_")
+            os.makedirs(self.spill_dir, exist_ok=True)
+            path = os.path.join(self.spill_dir, f"{key[0]}_{key[1]}.npy")
+            np.save(path, np.asarray(entry.samples))
+            self._entries[key] = SpilledAudio(path, entry.samplerate, entry.samples.nbytes)
+            self._memory_bytes -= entry.samples.nbytes
+            self._disk_bytes += entry.samples.nbytes
+
+        # Then evict the least recently used spilled recordings if the disk cap is exceeded
+        for key in list(self._entries):
+            if self._disk_bytes <= self.max_disk_bytes:
+                break
+            if isinstance(self._entries[key], SpilledAudio):
+                self._remove(key)
+
+
+# Process-wide store shared by the CLI loops and the Streamlit app
+audio_store = SessionAudioStore()
@@ -0,0 +1,191 @@
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+from embedding_cache import embedding_cache
+from text_analysis import analyze_text
+
+BENCH_SAMPLE_RATE = 16000
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "baseline.json")
+
+# Vocabulary for synthetic answers (interview-like words, some stopwords and cognitive words)
+VOCABULARY = (
+    "i am a software developer with five years of experience and i think my strengths include "
+    "communication leadership problem-solving teamwork and the ability to analyze and understand "
+    "complex projects i reflect on feedback and reason about the company mission culture values "
+    "growth opportunity because i want to contribute to innovative solutions in a dynamic environment"
+).split()
+
+# Function to generate a deterministic synthetic answer with the given number of words
+def synth_text(num_words, seed=0):
+    rng = np.random.default_rng(seed)
+    words = rng.choice(VOCABULARY, size=num_words)
+    sentences = [" ".join(words[i:i + 12]).capitalize() + "." for i in range(0, num_words, 12)]
+    return " ".join(sentences)
+
+# Function to generate synthetic audio: a pure tone, white noise, or a speech-like envelope with pauses
+def synth_audio(kind, seconds, samplerate=BENCH_SAMPLE_RATE, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * samplerate)) / samplerate
+    if kind == "tone":
+        y = 0.3 * np.sin(2 * np.pi * 220 * t)
+    elif kind == "noise":
+        y = 0.1 * rng.standard_normal(len(t))
+    else:
+        # Voiced harmonics modulated at a syllable rate of ~4 Hz, with a 1 s pause every 6 s
+        carrier = sum(np.sin(2 * np.pi * f0 * t) / k for k, f0 in enumerate((140, 280, 420, 560), 1))
+        envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) * (t % 6 < 5)
+        y = 0.2 * carrier * envelope + 0.005 * rng.standard_normal(len(t))
+    return y.astype(np.float32)
+
+# Function to write synthetic audio to a temporary WAV file so decoding is part of the measurement
+def synth_wav(kind, seconds, directory):
+    import soundfile as sf
+    path = os.path.join(directory, f"{kind}_{seconds}s.wav")
+    if not os.path.exists(path):
+        sf.write(path, synth_audio(kind, seconds), BENCH_SAMPLE_RATE, subtype="PCM_16")
+    return path
+
+# Input sizes: answer length in words, and (audio kind, seconds)
+TEXT_SIZES = (20, 100, 400)
+AUDIO_CASES = (("tone", 5), ("noise", 20), ("speech", 5), ("speech", 20), ("speech", 60))
+QUESTION = "What are your strengths?"
+
+# Function to build (case name, callable) pairs for one analyzer; imports happen here so they count as cold start
+def build_cases(name, workdir):
+    if name in ("calculate_similarity", "calculate_confidence"):
+        import update
+        if name == "calculate_similarity":
+            return [(f"{n}w", lambda text=synth_text(n): update.calculate_similarity(2, text)) for n in TEXT_SIZES]
+        return [(f"{kind}_{s}s", lambda path=synth_wav(kind, s, workdir): update.calculate_confidence(path)) for kind, s in AUDIO_CASES]
+
+    import integrated
+    if name == "evaluate_response":
+        path = synth_wav("speech", 20, workdir)
+        return [(f"{n}w_speech_20s", lambda text=synth_text(n): integrated.evaluate_response(text, path, QUESTION)) for n in TEXT_SIZES]
+    function = getattr(integrated, name)
+    if name == "semantic_coherence":
+        return [(f"{n}w", lambda text=synth_text(n): function(text, QUESTION)) for n in TEXT_SIZES]
+    return [(f"{n}w", lambda text=synth_text(n): function(text)) for n in TEXT_SIZES]
+
+# Analyzers covered by the benchmark
+ANALYZERS = (
+    "calculate_similarity", "calculate_confidence", "grammar_check", "emotion_recognition",
+    "semantic_coherence", "lexical_diversity", "cognitive_complexity", "evaluate_response",
+)
+
+# Function to empty the grammar pool's sentence cache, if the pool has been loaded
+def clear_grammar_cache():
+    from model_registry import registry
+    if registry.is_loaded("grammar"):
+        registry.get("grammar").clear_cache()
+
+# Function to read this process's peak resident memory in MB
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+# Function run in a fresh subprocess: measure cold start, then warm latency of every case
+def run_worker(name, repeats):
+    with tempfile.TemporaryDirectory() as workdir:
+        # Write the synthetic WAV files first so generating them is not timed
+        for kind, seconds in AUDIO_CASES:
+            synth_wav(kind, seconds, workdir)
+        start = time.perf_counter()
+        cases = build_cases(name, workdir)
+        cases[0][1]()  # First call pays imports and model loading
+        cold_seconds = time.perf_counter() - start
+
+        results = {"cold_seconds": round(cold_seconds, 4), "cases": {}}
+        for case, function in cases:
+            function()  # Warm-up call for this input size
+            latencies = []
+            for _ in range(repeats):
+                # Measure the encoders and the text analysis, not cache hits on the repeated input
+                embedding_cache.clear()
+                analyze_text.cache_clear()
+                clear_grammar_cache()
+                call_start = time.perf_counter()
+                function()
+                latencies.append(time.perf_counter() - call_start)
+            latencies = np.array(latencies)
+            results["cases"][case] = {
+                "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 3),
+                "p99_ms": round(float(np.percentile(latencies, 99)) * 1000, 3),
+                "throughput_per_s": round(len(latencies) / float(latencies.sum()), 2),
+            }
+    results["peak_rss_mb"] = peak_rss_mb()
+    return results
+
+# Function to run one analyzer in its own interpreter so cold start and peak RSS are isolated
+def run_isolated(name, repeats):
+    # Without the disk tier, so every run encodes from scratch
+    env = {key: value for key, value in os.environ.items() if key != "EMBEDDING_CACHE_DB"}
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker", name, "--repeats", str(repeats)],
+        check=True, capture_output=True, text=True, env=env,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+# Function to print results, with the ratio to the baseline when one is given
+def print_results(results, baseline=None, tolerance=0.2):
+    regressions = []
+    for name, result in results.items():
+        base = (baseline or {}).get(name)
+        ratio = f" ({result['cold_seconds'] / base['cold_seconds']:.2f}x baseline)" if base else ""
+        print(f"\n{name}: cold {result['cold_seconds']}s{ratio}, peak RSS {result['peak_rss_mb']} MB")
+        for case, stats in result["cases"].items():
+            line = f"  {case:>16}: p50 {stats['p50_ms']} ms, p99 {stats['p99_ms']} ms, {stats['throughput_per_s']}/s"
+            base_case = base["cases"].get(case) if base else None
+            if base_case:
+                change = stats["p50_ms"] / base_case["p50_ms"] if base_case["p50_ms"] else 1.0
+                line += f"  [{change:.2f}x baseline p50]"
+                if change > 1 + tolerance:
+                    regressions.append(f"{name}/{case}")
+            print(line)
+    return regressions
+
+# Command-line entry point
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every analyzer and the end-to-end evaluate_response.")
+    parser.add_argument("--analyzers", nargs="+", choices=ANALYZERS, default=list(ANALYZERS))
+    parser.add_argument("--repeats", type=int, default=30, help="warm calls per case")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, help="save results as the baseline")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, help="compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p50 slowdown before a case counts as a regression")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.repeats)))
+        return 0
+
+    results = {}
+    for name in args.analyzers:
+        print(f"Benchmarking {name}...", flush=True)
+        results[name] = run_isolated(name, args.repeats)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    regressions = print_results(results, baseline, args.tolerance)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({"created": time.strftime("%Y-%m-%d %H:%M:%S"), "python": sys.version.split()[0], "results": results}, f, indent=2)
+        print(f"\nBaseline saved to {args.save_baseline}")
+
+    if regressions:
+        print(f"\nRegressions beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
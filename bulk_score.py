@@ -0,0 +1,209 @@
+import argparse
+import csv
+import importlib.util
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Columns of the results file, in order
+COLUMNS = [
+    "audio_path", "question_id", "transcript",
+    "similarity", "confidence",
+    "sentiment", "lexical_diversity", "grammar_errors", "cognitive_complexity",
+    "emotion", "emotion_score", "pause_duration", "longest_pause", "pause_count",
+    "speaking_rate", "articulation_rate", "semantic_coherence",
+    "transcription_seconds", "similarity_seconds", "confidence_seconds",
+    "sentiment_seconds", "lexical_diversity_seconds", "grammar_errors_seconds",
+    "cognitive_complexity_seconds", "emotion_seconds", "pause_duration_seconds", "pacing_seconds",
+    "semantic_coherence_seconds", "total_seconds",
+]
+
+# evaluate_response keys -> result columns
+ANALYZER_COLUMNS = {
+    "Sentiment": "sentiment",
+    "Lexical Diversity": "lexical_diversity",
+    "Grammar Errors": "grammar_errors",
+    "Cognitive Complexity": "cognitive_complexity",
+    "Emotion": "emotion",
+    "Pause Duration": "pause_duration",
+    "Pacing": "pacing",
+    "Semantic Coherence": "semantic_coherence",
+}
+
+# Function to list the answers in a directory: <question_id>_<name>.wav with an optional <question_id>_<name>.txt transcript
+def jobs_from_directory(directory):
+    jobs = []
+    for name in sorted(os.listdir(directory)):
+        stem, ext = os.path.splitext(name)
+        if ext.lower() != ".wav":
+            continue
+        question_id = stem.split("_", 1)[0]
+        if not question_id.isdigit():
+            print(f"Skipping {name}: file name does not start with a question id", file=sys.stderr)
+            continue
+        transcript_path = os.path.join(directory, stem + ".txt")
+        transcript = None
+        if os.path.exists(transcript_path):
+            with open(transcript_path, encoding="utf-8") as f:
+                transcript = f.read().strip()
+        jobs.append({"audio_path": os.path.join(directory, name), "question_id": int(question_id), "transcript": transcript})
+    return jobs
+
+# Function to read a CSV manifest with audio_path, question_id and an optional transcript column
+def jobs_from_manifest(manifest_path):
+    base = os.path.dirname(os.path.abspath(manifest_path))
+    jobs = []
+    with open(manifest_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            audio_path = row["audio_path"]
+            if not os.path.isabs(audio_path):
+                audio_path = os.path.join(base, audio_path)
+            jobs.append({
+                "audio_path": audio_path,
+                "question_id": int(row["question_id"]),
+                "transcript": (row.get("transcript") or "").strip() or None,
+            })
+    return jobs
+
+# Function to drop a half-written last row left by a crashed run, so it is rescored
+# and the next appended row starts on a line of its own
+def repair_journal(journal_path):
+    if not os.path.exists(journal_path):
+        return
+    with open(journal_path, newline="", encoding="utf-8") as f:
+        lines = f.readlines()
+    # (first physical line, fields) of each record; quoted transcripts may span several lines
+    records = []
+    reader = csv.reader(lines)
+    try:
+        while True:
+            start = reader.line_num
+            records.append((start, next(reader)))
+    except StopIteration:
+        pass
+    except csv.Error:
+        records.append((start, None))
+    if not records:
+        return
+    start, last = records[-1]
+    if last is not None and len(last) == len(COLUMNS) and lines[-1].endswith("\n"):
+        return
+    keep = "".join(lines[:start])
+    print(f"Dropping an incomplete last row from {journal_path}", file=sys.stderr)
+    with open(journal_path, "r+", newline="", encoding="utf-8") as f:
+        f.truncate(len(keep.encode("utf-8")))
+
+# Function to read which answers an earlier (possibly crashed) run already scored
+def already_scored(journal_path):
+    if not os.path.exists(journal_path):
+        return set()
+    with open(journal_path, newline="", encoding="utf-8") as f:
+        return {row["audio_path"] for row in csv.DictReader(f)}
+
+
+# Worker processes load the models once, in the initializer, and keep them for every answer
+def init_worker():
+    global update, integrated
+    # Each worker scores one answer at a time, so one LanguageTool server (one JVM) per worker is enough
+    os.environ.setdefault("GRAMMAR_POOL_SIZE", "1")
+    import update
+    import integrated
+    integrated.registry.warm_up(["sentiment", "grammar", "emotion"])
+    update.load_similarity_model()
+
+# Function run in a worker process: score one answer and return its result row
+def score_answer(job):
+    start = time.perf_counter()
+    row = {"audio_path": job["audio_path"], "question_id": job["question_id"]}
+    timings = {}
+
+    text = job["transcript"]
+    if text is None:
+        text, timings["transcription"] = integrated.timed_call(update.transcribe_audio, job["audio_path"])
+    row["transcript"] = text
+    if not text:
+        raise ValueError("empty transcript")
+
+    audio = integrated.AudioFeatures.from_file(job["audio_path"])
+    row["similarity"], timings["similarity"] = integrated.timed_call(update.calculate_similarity, job["question_id"], text)
+    row["confidence"], timings["confidence"] = integrated.timed_call(update.calculate_confidence, audio)
+
+    analyzer_timings = {}
+    question = update.questions[job["question_id"]]
+    evaluation = integrated.evaluate_response(text, audio, question, timings=analyzer_timings)
+    for name, column in ANALYZER_COLUMNS.items():
+        row[column] = evaluation[name]
+        timings[column] = analyzer_timings.get(name)
+
+    # Flatten the nested analyzer outputs into scalar columns
+    row["sentiment"] = evaluation["Sentiment"]["compound"]
+    row["emotion"] = evaluation["Emotion"][0]["label"]
+    row["emotion_score"] = evaluation["Emotion"][0]["score"]
+    row["semantic_coherence"] = float(evaluation["Semantic Coherence"])
+    pacing = row.pop("pacing")
+    for name in ("longest_pause", "pause_count", "speaking_rate", "articulation_rate"):
+        row[name] = pacing[name]
+
+    for name, seconds in timings.items():
+        if seconds is not None:
+            row[f"{name}_seconds"] = round(seconds, 4)
+    row["total_seconds"] = round(time.perf_counter() - start, 4)
+    return row
+
+# Function to convert the finished CSV journal into a Parquet file
+def write_parquet(journal_path, output_path):
+    import pandas as pd
+    pd.read_csv(journal_path).to_parquet(output_path, index=False)
+
+# Command-line entry point
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a directory or manifest of recorded interview answers.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input-dir", help="directory of <question_id>_<name>.wav files (optional .txt transcripts)")
+    source.add_argument("--manifest", help="CSV with audio_path, question_id and optional transcript columns")
+    parser.add_argument("--output", required=True, help="results file (.csv or .parquet)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="number of scoring processes")
+    args = parser.parse_args(argv)
+
+    jobs = jobs_from_directory(args.input_dir) if args.input_dir else jobs_from_manifest(args.manifest)
+
+    # Rows are appended to a CSV as they finish, so a crashed run can resume where it stopped
+    parquet = args.output.lower().endswith(".parquet")
+    # Check before scoring, not after the whole run: Parquet output needs pandas and pyarrow
+    missing = [name for name in ("pandas", "pyarrow") if importlib.util.find_spec(name) is None] if parquet else []
+    if missing:
+        parser.error(f"--output .parquet needs {' and '.join(missing)} (pip install pandas pyarrow), or write a .csv instead")
+    journal_path = args.output + ".partial.csv" if parquet else args.output
+    repair_journal(journal_path)
+    done = already_scored(journal_path)
+    pending = [job for job in jobs if job["audio_path"] not in done]
+    print(f"{len(jobs)} answers found, {len(jobs) - len(pending)} already scored, {len(pending)} to score.")
+
+    write_header = not os.path.exists(journal_path) or os.path.getsize(journal_path) == 0
+    failures = 0
+    with open(journal_path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        if write_header:
+            writer.writeheader()
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker) as pool:
+            futures = {pool.submit(score_answer, job): job for job in pending}
+            for count, future in enumerate(as_completed(futures), 1):
+                job = futures[future]
+                try:
+                    writer.writerow(future.result())
+                    f.flush()
+                except Exception as e:
+                    # Failed answers are not journaled, so the next run retries them
+                    failures += 1
+                    print(f"Error scoring {job['audio_path']}: {e}", file=sys.stderr)
+                if count % 50 == 0 or count == len(futures):
+                    print(f"Scored {count}/{len(futures)}")
+
+    if parquet:
+        write_parquet(journal_path, args.output)
+    print(f"Results written to {args.output} ({failures} failed).")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,11 @@
-import nltk
-from nltk.tokenize import word_tokenize
-nltk.download('punkt')
+from text_analysis import analyze_text
 
 def cognitive_complexity(text):
-    cognitive_words = ['analyze', 'reason', 'reflect', 'understand', 'think']
-    tokens = word_tokenize(text.lower())
-    cognitive_count = sum(1 for word in tokens if word in cognitive_words)
-    return cognitive_count / len(tokens)  # Proportion of cognitive words
+    # Proportion of cognitive words, from the shared one-pass text analysis
+    return analyze_text(text).cognitive_complexity()
 
-# Example usage
-text = "I reflect on the complexities of the problem and analyze possible solutions."
-complexity_score = cognitive_complexity(text)
-print(f"Cognitive Complexity Score: {complexity_score}")
+if __name__ == "__main__":
+    # Example usage
+    text = "I reflect on the complexities of the problem and analyze possible solutions."
+    complexity_score = cognitive_complexity(text)
+    print(f"Cognitive Complexity Score: {complexity_score}")
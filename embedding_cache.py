@@ -0,0 +1,171 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+import numpy as np
+
+# Function to normalise text before hashing, so whitespace and Unicode variants share an entry
+def normalize_text(text):
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+# Function to build the cache key of a text embedded by a given model
+def cache_key(model_id, text):
+    return hashlib.sha256(f"{model_id}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+# Two-tier embedding cache keyed by (model id, normalised text hash).
+# The in-memory tier is an LRU of at most `max_items` vectors; the optional SQLite tier
+# at `disk_path` survives restarts and is shared by processes on the same machine.
+# Disk hits only read: their recency is collected in memory and written in one batch with the
+# next put, or every `recency_flush_seconds`, so processes sharing the file do not fight over
+# the write lock on every lookup.
+class EmbeddingCache:
+    def __init__(self, max_items=10000, disk_path=None, max_disk_items=1000000, recency_flush_seconds=60.0):
+        self.max_items = max_items
+        self.max_disk_items = max_disk_items
+        self.recency_flush_seconds = recency_flush_seconds
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._disk_writes = 0
+        self._touched = {}  # key -> last use not yet written to the disk tier
+        self._last_flush = time.monotonic()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if disk_path:
+            os.makedirs(os.path.dirname(os.path.abspath(disk_path)), exist_ok=True)
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, dtype TEXT, vector BLOB, last_used REAL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+            self._db.commit()
+
+    # Function to return one embedding per text, calling encode(list_of_texts) once for the texts not cached
+    def get_many(self, model_id, texts, encode):
+        keys = [cache_key(model_id, text) for text in texts]
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in found:
+                    continue
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+                    self.hits += 1
+            if self._db is not None:
+                for key, vector in self._read_disk([key for key in dict.fromkeys(keys) if key not in found]).items():
+                    found[key] = vector
+                    self._put_memory(key, vector)
+                    self.disk_hits += 1
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+        if missing:
+            vectors = encode(list(missing.values()))
+            with self._lock:
+                self.misses += len(missing)
+                for key, vector in zip(missing, vectors):
+                    vector = np.asarray(vector)
+                    vector.setflags(write=False)  # Cached vectors are shared, never modified
+                    found[key] = vector
+                    self._put_memory(key, vector)
+                if self._db is not None:
+                    self._write_disk({key: found[key] for key in missing})
+        return [found[key] for key in keys]
+
+    # Function to return the embedding of one text
+    def get(self, model_id, text, encode):
+        return self.get_many(model_id, [text], encode)[0]
+
+    # Function to report tier sizes and hit rates
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "memory_items": len(self._memory),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+            }
+
+    # Function to empty the in-memory tier (the disk tier is kept)
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+
+    # Function to close the disk tier
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._flush_recency()
+                self._db.commit()
+                self._db.close()
+                self._db = None
+
+    # Function to add a vector to the memory tier, evicting the least recently used (caller holds the lock)
+    def _put_memory(self, key, vector):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    # Function to read vectors from the disk tier (caller holds the lock)
+    def _read_disk(self, keys):
+        found = {}
+        # SQLite limits the number of bound parameters, so look keys up in slices
+        for start in range(0, len(keys), 500):
+            part = keys[start:start + 500]
+            rows = self._db.execute(
+                f"SELECT key, dtype, vector FROM embeddings WHERE key IN ({','.join('?' * len(part))})", part
+            ).fetchall()
+            for key, dtype, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=dtype)
+        if found:
+            now = time.time()
+            self._touched.update((key, now) for key in found)
+            if time.monotonic() - self._last_flush >= self.recency_flush_seconds:
+                self._flush_recency()
+                self._db.commit()
+        return found
+
+    # Function to write the collected last-used times in one statement (caller holds the lock and commits)
+    def _flush_recency(self):
+        if self._touched:
+            self._db.executemany("UPDATE embeddings SET last_used = ? WHERE key = ?", [(used, key) for key, used in self._touched.items()])
+            self._touched.clear()
+        self._last_flush = time.monotonic()
+
+    # Function to write vectors to the disk tier and trim it to its size limit (caller holds the lock)
+    def _write_disk(self, vectors):
+        now = time.time()
+        self._db.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, dtype, vector, last_used) VALUES (?, ?, ?, ?)",
+            [(key, vector.dtype.str, np.ascontiguousarray(vector).tobytes(), now) for key, vector in vectors.items()],
+        )
+        # Recency rides along with the write transaction, before the trim reads it
+        self._flush_recency()
+        self._disk_writes += len(vectors)
+        # Counting rows is not free, so the size limit is checked every 1000 writes
+        if self._disk_writes >= 1000:
+            self._disk_writes = 0
+            excess = self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] - self.max_disk_items
+            if excess > 0:
+                self._db.execute(
+                    "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY last_used LIMIT ?)", (excess,)
+                )
+        self._db.commit()
+
+
+# Process-wide cache shared by every analyzer; set EMBEDDING_CACHE_DB to a file path to enable the disk tier
+embedding_cache = EmbeddingCache(
+    max_items=int(os.environ.get("EMBEDDING_CACHE_SIZE", "10000")),
+    disk_path=os.environ.get("EMBEDDING_CACHE_DB") or None,
+)
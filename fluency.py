@@ -1,11 +1,11 @@
-import language_tool_python
+from model_registry import registry
 
 def grammar_check(text):
-    tool = language_tool_python.LanguageTool('en-US')
-    matches = tool.check(text)
-    return len(matches)
+    # Long-lived LanguageTool servers; unchanged sentences come from the cache
+    return registry.get("grammar").count_errors(text)
 
-# Example usage
-text = "I am very excited to work in your company."
-errors = grammar_check(text)
-print(f"Grammar errors: {errors}")
+if __name__ == "__main__":
+    # Example usage
+    text = "I am very excited to work in your company."
+    errors = grammar_check(text)
+    print(f"Grammar errors: {errors}")
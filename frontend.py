@@ -1,95 +1,127 @@
 import os
-import speech_recognition as sr
-import librosa
-import numpy as np
+from transcription import transcribe_capture, TranscriptionError
 import streamlit as st
-from sentence_transformers import SentenceTransformer, util
-import tempfile
+from audio_features import AudioCapture, SPEECH_SAMPLE_RATE, calculate_confidence
+from audio_store import SessionAudioStore, new_session_id
+from question_bank import load_question_bank
+from sentence_similarity import load_similarity_model, calculate_similarity
+from keyword_matcher import KeywordMatcher
+from live_scoring import LiveScorer, LiveSession, PartialTranscriber
+from streaming_recorder import record_streaming
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+# HR interview questions and keywords, loaded from the question bank file
+question_bank = load_question_bank()
+questions = question_bank.questions
+
+# Session-keyed store for response audio, shared by every session. Streamlit does not report
+# closed sessions, so a session's audio is dropped after an hour without a new answer.
+@st.cache_resource
+def get_audio_store():
+    return SessionAudioStore(session_ttl=3600)
+
+# Background workers for recording and scoring, shared by every session
+@st.cache_resource
+def get_scoring_pool():
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="scoring")
+
+# Keyword tables of the question bank compiled once, for live keyword coverage
+@st.cache_resource
+def get_keyword_matcher():
+    return KeywordMatcher(question_bank.keywords)
 
-# Load the Hugging Face model for semantic similarity
-model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
-
-# Predefined data: HR interview questions and example answers
-questions = {
-    1: "Tell me about yourself.",
-    2: "What are your strengths?",
-    3: "Why do you want to work here?"
-}
-
-# Predefined answers: multiple examples for each question
-predefined_answers = {
-    1: [
-        "I am a software developer with 5 years of experience, passionate about creating innovative solutions.",
-        "I have a background in finance, with strong analytical skills and a drive to learn new technologies.",
-        "I am a recent graduate in marketing, eager to apply my knowledge in a dynamic environment."
-    ],
-    2: [
-        "My strengths include excellent communication, leadership abilities, and being a proactive team player.",
-        "I excel in problem-solving, adapting to new situations, and maintaining a positive attitude under pressure.",
-        "I am highly organized, detail-oriented, and skilled at managing multiple projects simultaneously."
-    ],
-    3: [
-        "I admire this company's mission to drive innovation and would love to contribute to that vision.",
-        "The opportunity to grow in a company with a strong culture and values aligns with my career goals.",
-        "I am drawn to this company's emphasis on employee development and impactful projects."
-    ]
-}
-
-# Function to calculate semantic similarity score
-def calculate_similarity(predefined_answers, user_answer):
-    predefined_embeddings = model.encode(predefined_answers, convert_to_tensor=True)
-    user_embedding = model.encode(user_answer, convert_to_tensor=True)
-    similarity_scores = util.pytorch_cos_sim(user_embedding, predefined_embeddings)
-    return round(similarity_scores.max().item() * 100, 2)
-
-# Function to calculate confidence score using Librosa
-def calculate_confidence(audio_path):
-    try:
-        # Load the audio file using librosa
-        y, sr = librosa.load(audio_path, sr=None)
-        
-        # Compute the energy (Root Mean Square energy)
-        energy = librosa.feature.rms(y=y)
-        energy_mean = np.mean(energy)
-        
-        # Compute Zero-Crossing Rate (a rough indication of speech clarity)
-        zcr = librosa.feature.zero_crossing_rate(y=y)
-        zcr_mean = np.mean(zcr)
-        
-        # Normalize energy and ZCR mean
-        energy_max = np.max(energy)
-        energy_scaled = (energy_mean / energy_max) if energy_max != 0 else energy_mean
-        
-        # Dynamic confidence score scaling using energy and ZCR
-        confidence_score = min(max((energy_scaled + zcr_mean) * 100, 0), 100)
-        
-        return round(confidence_score, 2)
-    
-    except Exception as e:
-        print(f"Error extracting confidence: {e}")
-        return 0
 
 # Function to capture and transcribe audio
-def get_audio_input():
+def get_audio_input(report_stage=None):
+    import speech_recognition as sr
     recognizer = sr.Recognizer()
     with sr.Microphone() as source:
         recognizer.adjust_for_ambient_noise(source)
         try:
             audio = recognizer.listen(source, timeout=30, phrase_time_limit=30)
-            audio_path = "user_response.wav"
-            with open(audio_path, "wb") as f:
-                f.write(audio.get_wav_data())
-            text = recognizer.recognize_google(audio)
-            return text, audio_path
-        except sr.UnknownValueError:
-            return "", ""
-        except sr.RequestError:
-            return "", ""
+            if report_stage:
+                report_stage("Transcribing your answer...", 0.5)
+            # Keep the answer in memory instead of a shared user_response.wav
+            capture = AudioCapture.from_audio_data(audio)
+            text = transcribe_capture(capture).text
+            if not text:
+                return "", None
+            return text, capture
+        except TranscriptionError:
+            return "", None
+
+# Function to record with live feedback: partial transcripts and audio chunks are scored while the candidate speaks
+def get_audio_input_live(job, similarity_model, keyword_matcher):
+    model, reference_embeddings = similarity_model
+    scorer = LiveScorer(job.question_id, model, reference_embeddings, keyword_matcher)
+    # Partial transcripts need word timestamps, so the live view uses the local engine by default
+    transcriber = PartialTranscriber(os.environ.get("LIVE_STT_BACKEND", "local"))
+    session = LiveSession(scorer, SPEECH_SAMPLE_RATE, transcriber, on_update=job.report_live)
+    try:
+        session.start()
+    except TranscriptionError as e:
+        # Record as usual and tell the UI why no live scores will appear
+        job.report_live({"error": str(e)})
+        session = None
+    try:
+        capture, _ = record_streaming(max_duration=30, on_chunk=session.add_chunk if session else None)
+    finally:
+        if session:
+            session.stop()
+    job.report_stage("Transcribing your answer...", 0.5)
+    try:
+        text = transcribe_capture(capture).text
+    except TranscriptionError:
+        return "", None
+    if not text:
+        return "", None
+    return text, capture
+
+# State of one background record-and-score job, polled by the UI
+class ScoringJob:
+    def __init__(self, session_id, question_id, live=False):
+        self.session_id = session_id
+        self.question_id = question_id
+        self.live = live
+        self.stage = "Waiting for a free worker..."
+        self.progress = 0.0
+        self.live_scores = None
+        self.future = None
+
+    # Function called from the worker thread to update the progress bar
+    def report_stage(self, stage, progress):
+        self.stage = stage
+        self.progress = progress
+
+    # Function called from the live scoring thread with the latest partial scores
+    def report_live(self, scores):
+        self.live_scores = scores
+
+# Function run on a worker thread: record, transcribe and score one answer
+def run_scoring_job(job, similarity_model, audio_store, keyword_matcher=None):
+    job.report_stage("Recording your answer...", 0.1)
+    if job.live:
+        user_answer, audio = get_audio_input_live(job, similarity_model, keyword_matcher)
+    else:
+        user_answer, audio = get_audio_input(job.report_stage)
+    if not user_answer:
+        return {"answer": ""}
+    # Scoring reads the recording back from the store, which owns it from here on
+    audio_store.put(job.session_id, job.question_id, audio)
+    audio = audio_store.get(job.session_id, job.question_id)
+
+    job.report_stage("Scoring your answer...", 0.8)
+    similarity_score = calculate_similarity(job.question_id, user_answer, similarity_model)
+    confidence_score = calculate_confidence(audio)
+    return {"answer": user_answer, "similarity": similarity_score, "confidence": confidence_score}
 
 # Streamlit frontend
 st.title("HR Interview Simulation")
 
+if "session_id" not in st.session_state:
+    st.session_state.session_id = new_session_id()
+
 if "question_idx" not in st.session_state:
     st.session_state.question_idx = 1
     st.session_state.scores = {}
@@ -108,33 +140,68 @@ if st.button("Start Interview"):
         st.session_state.question_idx = 1
     st.session_state.scores = {}
     st.session_state.confidence_scores = {}
-
-# Recording button
-if st.button("Record Answer"):
-    with st.spinner("Recording your answer..."):
-        user_answer, audio_path = get_audio_input()
-        if user_answer:
-            st.write(f"Your answer: {user_answer}")
-
-            predefined_set = predefined_answers[st.session_state.question_idx]
-            similarity_score = calculate_similarity(predefined_set, user_answer)
-            confidence_score = calculate_confidence(audio_path)
-
-            st.session_state.scores[st.session_state.question_idx] = similarity_score
-            st.session_state.confidence_scores[st.session_state.question_idx] = confidence_score
-
-            st.write(f"Similarity score: {similarity_score}%")
-            st.write(f"Confidence score: {confidence_score}%")
+    st.session_state.last_result = None
+    # A restarted interview no longer needs the previous answers' audio
+    get_audio_store().drop_session(st.session_state.session_id)
+
+# Recording button: hand the work to a background worker so the script thread stays free
+job = st.session_state.get("job")
+live_feedback = st.checkbox("Live feedback while I speak", value=False, disabled=job is not None)
+if st.button("Record Answer", disabled=job is not None):
+    job = ScoringJob(st.session_state.session_id, st.session_state.question_idx, live=live_feedback)
+    job.future = get_scoring_pool().submit(run_scoring_job, job, load_similarity_model(), get_audio_store(), get_keyword_matcher())
+    st.session_state.job = job
+    st.session_state.last_result = None
+
+# Poll the running job and show its progress
+if job is not None:
+    if not job.future.done():
+        st.progress(job.progress, text=job.stage)
+        live_scores = job.live_scores
+        if live_scores and "error" in live_scores:
+            st.info(f"Live feedback is unavailable: {live_scores['error']}")
+        elif live_scores:
+            # Partial scores, refreshed as the candidate speaks
+            similarity_column, keyword_column, confidence_column = st.columns(3)
+            similarity_column.metric("Similarity (live)", f"{live_scores['similarity']}%")
+            keyword_column.metric("Keyword coverage (live)", f"{live_scores['keyword_coverage']}%")
+            confidence_column.metric("Confidence (live)", f"{live_scores['confidence']}%")
+            st.caption(live_scores["transcript"])
+        time.sleep(0.25 if job.live else 0.5)
+        st.rerun()
+
+    st.session_state.job = None
+    try:
+        result = job.future.result()
+    except Exception as e:
+        result = {"answer": "", "error": str(e)}
+    if result.get("answer"):
+        st.session_state.scores[job.question_id] = result["similarity"]
+        st.session_state.confidence_scores[job.question_id] = result["confidence"]
+    st.session_state.last_result = result
+
+# Show the result of the last recorded answer
+result = st.session_state.get("last_result")
+if result:
+    if result.get("answer"):
+        st.write(f"Your answer: {result['answer']}")
+        st.write(f"Similarity score: {result['similarity']}%")
+        st.write(f"Confidence score: {result['confidence']}%")
+    else:
+        st.write(result.get("error") or "Sorry, I couldn't understand your answer. Please try again.")
 
 # Show the next question button
 if st.button("Next Question"):
     if st.session_state.question_idx < len(questions):
         st.session_state.question_idx += 1
+        st.session_state.last_result = None
     else:
         st.session_state.question_idx = 1  # restart or end interview
 
 # After the interview ends, show the report table
 if st.session_state.question_idx > len(questions):
+    # The summary only needs the scores, so the session's audio can go
+    get_audio_store().drop_session(st.session_state.session_id)
     st.write("**Interview Summary:**")
 
     # Prepare the data for the table
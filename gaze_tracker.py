@@ -0,0 +1,208 @@
+import argparse
+import time
+import cv2
+import dlib
+import numpy as np
+import matplotlib.pyplot as plt
+
+PREDICTOR_PATH = "shape_predictor_68_face_landmarks.dat"
+
+# Pre-trained models for face and landmarks, loaded on first use
+face_detector = None
+landmark_predictor = None
+
+# Function to load the dlib detector and landmark predictor once
+def load_models(predictor_path=PREDICTOR_PATH):
+    global face_detector, landmark_predictor
+    if face_detector is None:
+        face_detector = dlib.get_frontal_face_detector()
+        landmark_predictor = dlib.shape_predictor(predictor_path)
+
+# Function to scale a dlib rectangle between the downscaled and the full-resolution frame
+def scale_rect(rect, factor):
+    return dlib.rectangle(int(rect.left() * factor), int(rect.top() * factor),
+                          int(rect.right() * factor), int(rect.bottom() * factor))
+
+# Function to yield (frame, gray_frame, faces) for every frame of the video.
+# Full face detection runs on a downscaled frame every `detect_every` frames;
+# in between, each face is followed with a cheap correlation tracker.
+def track_faces(cap, detect_every=1, downscale=1.0):
+    trackers = []
+    frame_index = 0
+    while cap.isOpened():
+        ret, frame = cap.read()
+        if not ret:
+            break
+
+        # Convert to grayscale for processing
+        gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        small_frame = gray_frame if downscale == 1.0 else cv2.resize(gray_frame, None, fx=downscale, fy=downscale, interpolation=cv2.INTER_AREA)
+
+        if frame_index % detect_every == 0:
+            detections = face_detector(small_frame)
+            small_faces = list(detections)
+            trackers = []
+            if detect_every > 1:
+                for face in small_faces:
+                    tracker = dlib.correlation_tracker()
+                    tracker.start_track(small_frame, face)
+                    trackers.append(tracker)
+        else:
+            small_faces = []
+            for tracker in trackers:
+                tracker.update(small_frame)
+                position = tracker.get_position()
+                small_faces.append(dlib.rectangle(int(position.left()), int(position.top()), int(position.right()), int(position.bottom())))
+
+        faces = small_faces if downscale == 1.0 else [scale_rect(face, 1 / downscale) for face in small_faces]
+        frame_index += 1
+        yield frame, gray_frame, faces
+
+# Function to get the centre of both eyes from the 68-point landmarks
+def eye_centers(landmarks):
+    points = np.array([(landmarks.part(i).x, landmarks.part(i).y) for i in range(36, 48)])
+    left_eye_center = points[:6].mean(axis=0).astype(int)
+    right_eye_center = points[6:].mean(axis=0).astype(int)
+    return left_eye_center, right_eye_center
+
+# Fixed-size gaze accumulator: eye centres are binned into a 2D histogram as frames arrive,
+# so memory stays constant however long the video is
+class GazeAccumulator:
+    def __init__(self, frame_width, frame_height, bins=(64, 36), center_fraction=0.5):
+        self.frame_width = frame_width
+        self.frame_height = frame_height
+        self.bins = bins
+        self.center_fraction = center_fraction
+        self.histogram = np.zeros((bins[1], bins[0]), dtype=np.float64)  # rows are y, columns are x
+        self.count = 0
+        self.mean = np.zeros(2)
+        self.m2 = np.zeros(2)
+        self.frames = 0
+        self.face_frames = 0
+        self.on_camera_frames = 0
+
+    # Function to add the eye centres found in one frame (an empty list if no face was found)
+    def add_frame(self, points):
+        self.frames += 1
+        if len(points) == 0:
+            return
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self.face_frames += 1
+
+        x_bins = np.clip((points[:, 0] * self.bins[0] / self.frame_width).astype(int), 0, self.bins[0] - 1)
+        y_bins = np.clip((points[:, 1] * self.bins[1] / self.frame_height).astype(int), 0, self.bins[1] - 1)
+        np.add.at(self.histogram, (y_bins, x_bins), 1)
+
+        # Running mean and variance (parallel Welford update with this frame's points)
+        frame_count = len(points)
+        frame_mean = points.mean(axis=0)
+        delta = frame_mean - self.mean
+        total = self.count + frame_count
+        self.m2 += ((points - frame_mean) ** 2).sum(axis=0) + delta ** 2 * self.count * frame_count / total
+        self.mean += delta * frame_count / total
+        self.count = total
+
+        # Looking at the camera ~ the eyes sit in the central part of the frame
+        offset = np.abs(frame_mean / (self.frame_width, self.frame_height) - 0.5)
+        if np.all(offset <= self.center_fraction / 2):
+            self.on_camera_frames += 1
+
+    # Function to summarise the gaze: mean position, dispersion and fraction of frames on camera
+    def statistics(self):
+        variance = self.m2 / self.count if self.count else np.zeros(2)
+        return {
+            "frames": self.frames,
+            "face_fraction": self.face_frames / self.frames if self.frames else 0.0,
+            "on_camera_fraction": self.on_camera_frames / self.frames if self.frames else 0.0,
+            "mean_x": float(self.mean[0]),
+            "mean_y": float(self.mean[1]),
+            "std_x": float(np.sqrt(variance[0])),
+            "std_y": float(np.sqrt(variance[1])),
+            "dispersion": float(np.sqrt(variance.sum())),
+        }
+
+    # Function to smooth the histogram once, at the end, and normalise it to [0, 1]
+    def heatmap(self, sigma=1.5):
+        smoothed = cv2.GaussianBlur(self.histogram, (0, 0), sigma)
+        peak = smoothed.max()
+        return smoothed / peak if peak else smoothed
+
+# Function to track the eyes through a video and save a gaze heatmap
+def process_video(video_path, output_heatmap="heatmap.png", headless=False, detect_every=None, downscale=None):
+    load_models()
+    # Headless mode: no window, detection on half-size frames every 5th frame, tracking in between
+    if detect_every is None:
+        detect_every = 5 if headless else 1
+    if downscale is None:
+        downscale = 0.5 if headless else 1.0
+
+    # Open the video
+    cap = cv2.VideoCapture(video_path)
+    accumulator = GazeAccumulator(cap.get(cv2.CAP_PROP_FRAME_WIDTH) or 1, cap.get(cv2.CAP_PROP_FRAME_HEIGHT) or 1)
+    frame_count = 0
+    start = time.perf_counter()
+
+    for frame, gray_frame, faces in track_faces(cap, detect_every, downscale):
+        frame_count += 1
+        frame_points = []
+        for face in faces:
+            # The landmark predictor only looks at the pixels inside the tracked face box
+            landmarks = landmark_predictor(gray_frame, face)
+            left_eye_center, right_eye_center = eye_centers(landmarks)
+
+            frame_points.append(left_eye_center)
+            frame_points.append(right_eye_center)
+
+            if not headless:
+                # Draw eyes on the frame (for visualization, optional)
+                cv2.circle(frame, tuple(left_eye_center), 3, (255, 0, 0), -1)
+                cv2.circle(frame, tuple(right_eye_center), 3, (255, 0, 0), -1)
+
+        # Bin this frame's gaze points
+        accumulator.add_frame(frame_points)
+
+        if not headless:
+            # Display the frame (optional, for debugging)
+            cv2.imshow("Processing Video", frame)
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                break
+
+    fps = cap.get(cv2.CAP_PROP_FPS) or 0
+    cap.release()
+    if not headless:
+        cv2.destroyAllWindows()
+
+    elapsed = time.perf_counter() - start
+    if fps and elapsed:
+        print(f"Processed {frame_count} frames in {elapsed:.1f}s ({frame_count / fps / elapsed:.1f}x real time)")
+
+    # Generate Heatmap
+    generate_heatmap(accumulator, output_heatmap, show=not headless)
+    return accumulator.statistics()
+
+# Function to render the accumulated gaze histogram as a heatmap
+def generate_heatmap(accumulator, output_file, show=True):
+    plt.figure(figsize=(10, 6))
+    # extent puts the origin at the top left, matching image coordinates
+    plt.imshow(accumulator.heatmap(), cmap="Reds", extent=(0, accumulator.frame_width, accumulator.frame_height, 0), aspect="auto")
+    plt.colorbar(label="Relative gaze density")
+    plt.title("Eye Gaze Heatmap")
+    plt.savefig(output_file)
+    if show:
+        plt.show()
+    plt.close()
+
+    print(f"Heatmap saved as {output_file}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Track eye gaze in an interview video and save a heatmap.")
+    parser.add_argument("video")
+    parser.add_argument("--output", default="eye_gaze_heatmap.png")
+    parser.add_argument("--headless", action="store_true", help="no display window; detect on downscaled frames and track in between")
+    parser.add_argument("--detect-every", type=int, help="run full face detection every N frames")
+    parser.add_argument("--downscale", type=float, help="scale factor for the detection frames")
+    args = parser.parse_args()
+    stats = process_video(args.video, args.output, headless=args.headless, detect_every=args.detect_every, downscale=args.downscale)
+    print("Gaze statistics:")
+    for name, value in stats.items():
+        print(f" - {name}: {value:.3f}" if isinstance(value, float) else f" - {name}: {value}")
@@ -0,0 +1,135 @@
+import bisect
+import hashlib
+import queue
+import re
+import threading
+from collections import OrderedDict
+
+# Sentence boundary: end punctuation followed by whitespace
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+# Separator placed between sentences sent in one request, so every match maps back to one sentence
+SEPARATOR = "\n\n"
+
+# Function to split a text into sentences
+def split_sentences(text):
+    return [sentence for sentence in SENTENCE_SPLIT.split(text.strip()) if sentence]
+
+# Function to key the cache on the sentence content
+def sentence_key(sentence):
+    return hashlib.sha1(sentence.encode("utf-8")).hexdigest()
+
+# Pool of long-lived local LanguageTool servers with a per-sentence result cache.
+# Each server is started once: the first at load time, the rest on first need. Concurrent
+# checks use different servers, and sentences already checked are answered from the cache.
+class LanguageToolPool:
+    def __init__(self, size=2, language="en-US", cache_size=10000):
+        self.size = size
+        self.language = language
+        self.cache_size = cache_size
+        self._idle = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    # Function to take an idle server, starting a new one while the pool is below its size
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            start_new = self._created < self.size
+            if start_new:
+                self._created += 1
+        if start_new:
+            import language_tool_python
+            try:
+                return language_tool_python.LanguageTool(self.language)
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        return self._idle.get()
+
+    # Function to start servers ahead of the first check (at most the pool size), so no request pays the JVM start-up
+    def start(self, count=1):
+        tools = []
+        while self._created < min(count, self.size):
+            tools.append(self._acquire())
+        for tool in tools:
+            self._release(tool)
+        return self
+
+    # Function to return a server to the pool
+    def _release(self, tool):
+        self._idle.put(tool)
+
+    # Function to check sentences, returning each sentence's matches as (rule id, message) tuples
+    def check_sentences(self, sentences):
+        keys = [sentence_key(sentence) for sentence in sentences]
+        results = {}
+        missing = {}
+        with self._lock:
+            for key, sentence in zip(keys, sentences):
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    results[key] = self._cache[key]
+                    self.hits += 1
+                elif key not in missing:
+                    missing[key] = sentence
+                    self.misses += 1
+
+        if missing:
+            # All uncached sentences go to one server in a single request
+            found = self._check_uncached(list(missing.values()))
+            with self._lock:
+                for key, matches in zip(missing, found):
+                    self._cache[key] = results[key] = matches
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return [results[key] for key in keys]
+
+    # Function to check sentences joined into one text and attribute each match to its sentence
+    def _check_uncached(self, sentences):
+        starts = []
+        position = 0
+        for sentence in sentences:
+            starts.append(position)
+            position += len(sentence) + len(SEPARATOR)
+
+        tool = self._acquire()
+        try:
+            matches = tool.check(SEPARATOR.join(sentences))
+        finally:
+            self._release(tool)
+
+        found = [[] for _ in sentences]
+        for match in matches:
+            index = max(bisect.bisect_right(starts, match.offset) - 1, 0)
+            found[index].append((match.ruleId, match.message))
+        return found
+
+    # Function to count grammar errors in a text
+    def count_errors(self, text):
+        return sum(len(matches) for matches in self.check_sentences(split_sentences(text)))
+
+    # Function to forget every cached sentence result (the servers keep running)
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+    # Function to report cache effectiveness
+    def stats(self):
+        with self._lock:
+            return {"servers": self._created, "cached_sentences": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+    # Function to shut down every idle server
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
@@ -0,0 +1,89 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Entry points and analyzers whose import time is tracked
+DEFAULT_MODULES = (
+    "text_analysis", "keyword_matcher", "main", "integrated", "update",
+    "bulk_score", "scoring_service", "transcription", "audio_features",
+)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "import_baseline.json")
+
+# Function to import one module in a fresh interpreter with -X importtime and parse the report
+def profile_import(module):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        # Lines look like "import time:       123 |       4567 |   package.module"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        imports.append((name.strip(), int(self_us), int(cumulative_us)))
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "unknown error"
+        return {"error": error}
+    # The module itself is reported last, with everything it pulled in as its cumulative time
+    total_us = next((cumulative for name, _, cumulative in reversed(imports) if name == module), 0)
+    # Cost of each top-level package: the largest cumulative time of any of its modules
+    top_level = {}
+    for name, _, cumulative in imports:
+        package = name.split(".")[0]
+        if package != module:
+            top_level[package] = max(top_level.get(package, 0), cumulative)
+    heaviest = sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:8]
+    return {
+        "seconds": round(total_us / 1e6, 3),
+        "modules": len(imports),
+        "heaviest": [[package, round(us / 1e6, 3)] for package, us in heaviest],
+    }
+
+# Function to print the report, with the ratio to the baseline when one is given
+def print_report(results, baseline=None, tolerance=0.2, budget=None):
+    failures = []
+    for module, result in results.items():
+        if "error" in result:
+            print(f"{module}: import failed ({result['error']})")
+            continue
+        line = f"{module}: {result['seconds']}s, {result['modules']} modules"
+        base = (baseline or {}).get(module)
+        if base and "seconds" in base and base["seconds"]:
+            change = result["seconds"] / base["seconds"]
+            line += f"  [{change:.2f}x baseline]"
+            if change > 1 + tolerance:
+                failures.append(module)
+        if budget is not None and result["seconds"] > budget:
+            line += f"  [over the {budget}s budget]"
+            failures.append(module)
+        print(line)
+        for package, seconds in result["heaviest"]:
+            print(f"    {package:>24}: {seconds}s")
+    return failures
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile how long importing each entry point takes (python -X importtime).")
+    parser.add_argument("modules", nargs="*", default=list(DEFAULT_MODULES))
+    parser.add_argument("--budget", type=float, help="fail if any module takes longer than this many seconds to import")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, help="write the results as the new baseline")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, help="compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown against the baseline (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    results = {module: profile_import(module) for module in args.modules}
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    failures = print_report(results, baseline, args.tolerance, args.budget)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.save_baseline}")
+    if failures:
+        raise SystemExit(f"Import time regressions: {', '.join(failures)}")
@@ -1,141 +1,294 @@
-import os
-import sounddevice as sd
-import soundfile as sf
-import speech_recognition as sr
-import librosa
-import numpy as np
-from transformers import pipeline
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-import language_tool_python
-import nltk
-from nltk.tokenize import word_tokenize
-from collections import Counter
-# import pyAudioAnalysis.audioFeatureExtraction as aF
-
-# Download necessary NLTK data
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from transcription import transcribe_source, TranscriptionError
+from model_registry import registry, print_report, SENTENCE_MODEL_ID
+from reference_index import encode_answers, load_question_embeddings
+from question_bank import load_question_bank
+from text_analysis import analyze_text
+from audio_store import audio_store, new_session_id
+from audio_features import AudioFeatures, AudioCapture, SPEECH_SAMPLE_RATE
+from vad import analyze_pauses
+from streaming_recorder import record_audio_streaming
 
 
 # Function to capture audio using sounddevice
-def record_audio(filename, duration=10, samplerate=44100):
+def record_audio(filename=None, duration=10, samplerate=SPEECH_SAMPLE_RATE):
     print("Recording your answer...")
     try:
-        data = sd.rec(int(samplerate * duration), samplerate=samplerate, channels=2, dtype='int16', blocking=True)
-        sf.write(filename, data, samplerate, format='WAV')
-        print("Recording completed and saved.")
+        import sounddevice as sd
+        # Record mono int16 speech-band audio straight into memory
+        data = sd.rec(int(samplerate * duration), samplerate=samplerate, channels=1, dtype='int16', blocking=True)
+        capture = AudioCapture(data[:, 0], samplerate)
+        # Saving to disk is optional and happens in the background
+        if filename:
+            capture.save_async(filename)
+        print("Recording completed.")
+        return capture
     except Exception as e:
         print(f"Error during recording: {e}")
+        return None
 
-# Function to transcribe audio using SpeechRecognition
-def transcribe_audio(filename):
-    recognizer = sr.Recognizer()
+# Function to transcribe audio with the configured speech-to-text backend
+def transcribe_audio(audio):
     try:
-        with sr.AudioFile(filename) as source:
-            audio = recognizer.record(source)
-            return recognizer.recognize_google(audio)
-    except sr.UnknownValueError:
-        print("Sorry, I couldn't understand your answer. Please try again.")
-        return ""
-    except sr.RequestError as e:
+        text = transcribe_source(audio).text
+    except TranscriptionError as e:
         print(f"Error with the speech recognition service: {e}")
         return ""
+    if not text:
+        print("Sorry, I couldn't understand your answer. Please try again.")
+    return text
 
 # Function to capture and process audio input
-def get_audio_input():
-    audio_path = "user_response.wav"
-    record_audio(audio_path, duration=10)
-    text = transcribe_audio(audio_path)
-    return text, audio_path
+def get_audio_input(streaming=True, save_path=None):
+    if streaming:
+        # Stops early once the candidate has finished speaking
+        audio, _ = record_audio_streaming(save_path, max_duration=30)
+    else:
+        audio = record_audio(save_path, duration=10)
+    if audio is None:
+        return "", None
+    # The in-memory capture goes straight to ASR and the feature extractors
+    text = transcribe_audio(audio)
+    return text, audio
 
 # Sentiment Analysis using VADER
 def analyze_sentiment(text):
-    analyzer = SentimentIntensityAnalyzer()
+    analyzer = registry.get("sentiment")
     sentiment_score = analyzer.polarity_scores(text)
     return sentiment_score
 
-# Lexical Diversity and Word Frequency
+# Lexical Diversity and Word Frequency from the shared text analysis
 def lexical_diversity(text):
-    words = text.split()
-    stop_words = set(nltk.corpus.stopwords.words('english'))
-    filtered_words = [word for word in words if word.lower() not in stop_words]
-    word_counts = Counter(filtered_words)
-    lexical_diversity_score = len(filtered_words) / len(set(filtered_words))  # Type-Token Ratio (TTR)
-    return lexical_diversity_score, word_counts.most_common(5)
+    return analyze_text(text).lexical_diversity()
 
 # Grammar Check using LanguageTool
 def grammar_check(text):
-    tool = language_tool_python.LanguageTool('en-US')
-    matches = tool.check(text)
-    return len(matches)
+    # Long-lived LanguageTool servers; unchanged sentences come from the cache
+    return registry.get("grammar").count_errors(text)
 
 # Cognitive Complexity based on cognitive-related words
 def cognitive_complexity(text):
-    cognitive_words = ['analyze', 'reason', 'reflect', 'understand', 'think']
-    tokens = word_tokenize(text.lower())
-    cognitive_count = sum(1 for word in tokens if word in cognitive_words)
-    return cognitive_count / len(tokens)  # Proportion of cognitive words
+    return analyze_text(text).cognitive_complexity()  # Proportion of cognitive words
 
 # Emotion Recognition using Hugging Face's Emotion Model
+# Answers longer than the model's 512-token limit are truncated, as in emotion_recognition_batch
 def emotion_recognition(text):
-    emotion_classifier = pipeline("text-classification", model="j-hartmann/emotion-english-distilroberta-base")
-    return emotion_classifier(text)
+    emotion_classifier = registry.get("emotion")
+    return emotion_classifier(text, truncation=True)
+
+# Pacing: pause statistics plus speaking and articulation rate (words per minute)
+def pacing(word_count, audio_file):
+    return analyze_pauses(audio_file, word_count=word_count).summary()
 
-# Pause Duration Analysis using pyAudioAnalysis
-def pacing_and_pause(audio_file):
-    [fs, signal] = aF.read_audio_file(audio_file)
-    features, _ = aF.stFeatureExtraction(signal, fs, 0.050, 0.025)
-    pause_duration = np.sum(features[2] < 0.02)  # Detecting pauses based on energy threshold
-    return pause_duration
+# Pause Duration read from the Pacing result, so the voice activity detector runs once per answer
+def pause_duration(pacing_summary):
+    return None if pacing_summary is None else pacing_summary["total_pause"]
 
-# Semantic Coherence using Hugging Face's BERT embeddings
+# Embeddings of the question bank's questions, computed once per bank and memory-mapped from the cache
+question_embeddings = None
+
+# Function to get the embedding of each question: bank questions are precomputed, others go through the embedding cache
+def embed_questions(model, questions):
+    global question_embeddings
+    if question_embeddings is None:
+        question_embeddings = load_question_embeddings(model, SENTENCE_MODEL_ID, load_question_bank().questions)
+    unknown = [question for question in dict.fromkeys(questions) if question not in question_embeddings]
+    extra = dict(zip(unknown, encode_answers(model, unknown))) if unknown else {}
+    return [question_embeddings[question] if question in question_embeddings else extra[question] for question in questions]
+
+# Semantic Coherence: cosine of the pooled sentence embeddings of the answer and the question.
+# The answer embedding is the one similarity scoring uses, so it comes from the embedding cache.
 def semantic_coherence(text, question):
-    similarity_model = pipeline('feature-extraction', model='bert-base-uncased')
-    question_embedding = similarity_model(question)[0][0]
-    text_embedding = similarity_model(text)[0][0]
-    similarity_score = np.dot(question_embedding, text_embedding) / (np.linalg.norm(question_embedding) * np.linalg.norm(text_embedding))
-    return similarity_score
+    model = registry.get("sentence_encoder")
+    question_embedding = embed_questions(model, [question])[0]
+    text_embedding = encode_answers(model, [text])[0]
+    return float(question_embedding @ text_embedding)
+
+# Function to group text indices into length-sorted batches so each batch pads to a similar length
+def length_buckets(texts, batch_size=16):
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i].split()))
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+# Emotion Recognition for many texts at once, one padded batch per length bucket
+def emotion_recognition_batch(texts, batch_size=16):
+    emotion_classifier = registry.get("emotion")
+    emotions = [None] * len(texts)
+    for bucket in length_buckets(texts, batch_size):
+        outputs = emotion_classifier([texts[i] for i in bucket], batch_size=len(bucket), truncation=True)
+        for i, output in zip(bucket, outputs):
+            emotions[i] = [output]  # Same shape as emotion_recognition(text)
+    return emotions
+
+# Semantic Coherence for many (text, question) pairs, encoding all uncached answers in one call
+def semantic_coherence_batch(texts, questions, batch_size=16):
+    model = registry.get("sentence_encoder")
+    question_vectors = embed_questions(model, questions)
+    text_embeddings = encode_answers(model, texts, batch_size=batch_size)
+    return [float(question_embedding @ text_embedding) for question_embedding, text_embedding in zip(question_vectors, text_embeddings)]
+
+# Lexical diversity score only, as reported in the evaluation
+def lexical_diversity_score(text):
+    return lexical_diversity(text)[0]
+
+# Analyzers run by evaluate_response: name -> (function, input, executor)
+# Torch inference and the LanguageTool round-trip release the GIL, so they run on threads;
+# pure-Python and NumPy audio work runs in worker processes.
+ANALYZERS = {
+    "Sentiment": (analyze_sentiment, "text", "process"),
+    "Lexical Diversity": (lexical_diversity_score, "text", "process"),
+    "Grammar Errors": (grammar_check, "text", "thread"),
+    "Cognitive Complexity": (cognitive_complexity, "text", "process"),
+    "Emotion": (emotion_recognition, "text", "thread"),
+    "Pacing": (pacing, "words_audio", "process"),
+    "Semantic Coherence": (semantic_coherence, "text_question", "thread"),
+}
+
+# Results derived from another analyzer's result instead of a pass of their own: name -> (source, function)
+DERIVED = {
+    "Pause Duration": ("Pacing", pause_duration),
+}
+# Order of the results in an evaluation
+RESULT_NAMES = ["Sentiment", "Lexical Diversity", "Grammar Errors", "Cognitive Complexity", "Emotion",
+                "Pause Duration", "Pacing", "Semantic Coherence"]
+
+# Per-analyzer timeouts in seconds for the concurrent mode
+DEFAULT_TIMEOUTS = {
+    "Sentiment": 10,
+    "Lexical Diversity": 10,
+    "Grammar Errors": 30,
+    "Cognitive Complexity": 10,
+    "Emotion": 30,
+    "Pacing": 20,
+    "Semantic Coherence": 30,
+}
+
+_executors = {}
+
+# Function to lazily create the shared thread and process pools. Each pool has one worker per
+# analyzer it runs, so every analyzer of an evaluation starts at once and its timeout measures
+# its own run rather than time spent queued behind the others. Worker processes are spawned,
+# not forked, because the parent already runs torch and thread pools.
+def get_executor(kind):
+    if kind not in _executors:
+        workers = sum(1 for _, _, executor_kind in ANALYZERS.values() if executor_kind == kind)
+        if kind == "thread":
+            _executors[kind] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analyzer")
+        else:
+            _executors[kind] = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return _executors[kind]
+
+# Function to shut down the analyzer pools (e.g. at the end of a batch run)
+def shutdown_executors():
+    for executor in _executors.values():
+        executor.shutdown(wait=False, cancel_futures=True)
+    _executors.clear()
+
+# Function to build the positional arguments of an analyzer
+def analyzer_args(kind, text, audio, question):
+    if kind == "text":
+        return (text,)
+    if kind == "audio":
+        return (audio,)
+    if kind == "words_audio":
+        # The word count comes from the shared text analysis, computed in this process
+        return (len(analyze_text(text).words), audio)
+    return (text, question)
+
+# Function to fill in the derived results and put the evaluation in result order
+def finish_evaluation(evaluation, precomputed):
+    for name, (source, function) in DERIVED.items():
+        if name not in precomputed:
+            evaluation[name] = function(evaluation.get(source))
+    return {name: evaluation[name] for name in RESULT_NAMES}
+
+# Function to run an analyzer and measure how long it took (module level so it pickles)
+def timed_call(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
 
 # Function to evaluate the response for multiple aspects
-def evaluate_response(text, audio_file, question):
-    sentiment = analyze_sentiment(text)
-    lexical_div, common_words = lexical_diversity(text)
-    grammar_errors = grammar_check(text)
-    complexity = cognitive_complexity(text)
-    emotion = emotion_recognition(text)
-    pacing = pacing_and_pause(audio_file)
-    coherence = semantic_coherence(text, question)
-
-    # Combine the features into an evaluation
-    evaluation = {
-        "Sentiment": sentiment,
-        "Lexical Diversity": lexical_div,
-        "Grammar Errors": grammar_errors,
-        "Cognitive Complexity": complexity,
-        "Emotion": emotion,
-        "Pause Duration": pacing,
-        "Semantic Coherence": coherence
-    }
+def evaluate_response(text, audio_file, question, concurrent=False, timeouts=None, timings=None, precomputed=None):
+    precomputed = precomputed or {}
+    timings = {} if timings is None else timings
+    evaluation = dict(precomputed)
+
+    if not concurrent:
+        # Decode the answer audio once for every audio analyzer that still has to run
+        needs_audio = any(kind in ("audio", "words_audio") and name not in precomputed for name, (_, kind, _) in ANALYZERS.items())
+        audio = AudioFeatures.from_source(audio_file) if needs_audio else None
+        for name, (function, kind, _) in ANALYZERS.items():
+            if name not in precomputed:
+                evaluation[name], timings[name] = timed_call(function, *analyzer_args(kind, text, audio, question))
+        return finish_evaluation(evaluation, precomputed)
+
+    # Process-pool analyzers receive a pickled copy of the capture; only the thread pool shares it
+    timeouts = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+    futures = {}
+    for name, (function, kind, executor_kind) in ANALYZERS.items():
+        if name not in precomputed:
+            future = get_executor(executor_kind).submit(timed_call, function, *analyzer_args(kind, text, audio_file, question))
+            futures[name] = (future, time.monotonic())
+
+    # Collect results; a slow or failing analyzer leaves a partial evaluation instead of failing it
+    incomplete = {}
+    for name, (future, submitted) in futures.items():
+        remaining = timeouts[name] - (time.monotonic() - submitted)
+        try:
+            evaluation[name], timings[name] = future.result(timeout=max(remaining, 0))
+        except FutureTimeoutError:
+            # Only drops the task if it has not started; a running analyzer finishes in the background
+            future.cancel()
+            evaluation[name] = None
+            incomplete[name] = f"timed out after {timeouts[name]}s"
+        except Exception as e:
+            evaluation[name] = None
+            incomplete[name] = f"{type(e).__name__}: {e}"
+
+    evaluation = finish_evaluation(evaluation, precomputed)
+    if incomplete:
+        evaluation["Incomplete"] = incomplete
     return evaluation
 
+# Function to evaluate many (text, audio_file, question) responses, batching every transformer call
+def evaluate_responses(responses, batch_size=16, concurrent=False):
+    texts = [text for text, _, _ in responses]
+    questions = [question for _, _, question in responses]
+    emotions = emotion_recognition_batch(texts, batch_size)
+    coherences = semantic_coherence_batch(texts, questions, batch_size)
+    return [
+        evaluate_response(text, audio_file, question, concurrent=concurrent,
+                          precomputed={"Emotion": emotion, "Semantic Coherence": coherence})
+        for (text, audio_file, question), emotion, coherence in zip(responses, emotions, coherences)
+    ]
+
 # Example: Simulate a HR Interview
 def interview():
-    questions = [
-        "Tell me about yourself.",
-        "What are your strengths?",
-        "Why do you want to work here?"
-    ]
+    questions = load_question_bank().questions
+    session_id = new_session_id()
 
-    for question in questions:
+    for question_id, question in questions.items():
         print(f"Question: {question}")
-        text, audio_path = get_audio_input()
+        text, audio = get_audio_input()
 
         if text:
             print(f"Transcribed Text: {text}")
-            evaluation = evaluate_response(text, audio_path, question)
+            # Scoring reads the recording back from the store, which owns it from here on
+            audio_store.put(session_id, question_id, audio)
+            audio = audio_store.get(session_id, question_id)
+            evaluation = evaluate_response(text, audio, question, concurrent="--concurrent" in sys.argv)
             print("\nEvaluation Summary:")
             for criterion, score in evaluation.items():
                 print(f"{criterion}: {score}")
         else:
             print("No valid answer received. Moving to the next question.\n")
+    audio_store.drop_session(session_id)
 
 if __name__ == "__main__":
+    # Optionally load every model up front so the first answer is not slowed down
+    if "--warm-up" in sys.argv:
+        print_report(registry.warm_up())
     interview()
@@ -0,0 +1,111 @@
+import re
+from collections import deque
+
+# Words are runs of letters and digits, so "problem-solving", "problem solving" and
+# "Problem-Solving." all become the same token sequence
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Function to split text into lowercase word tokens
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+# Keyword tables of every question compiled into one token-level Aho-Corasick automaton.
+# An answer is scanned once, whatever the number of questions and phrases, and each
+# match is credited to every question whose table contains that phrase.
+class KeywordMatcher:
+    def __init__(self, keyword_tables):
+        # keyword_tables: {question_id: {phrase: weight}}
+        self.totals = {question_id: sum(table.values()) for question_id, table in keyword_tables.items()}
+        self.phrases = []  # phrase id -> [(question_id, phrase, weight)]
+        phrase_ids = {}
+        self.goto = [{}]
+        self.outputs = [[]]
+
+        for question_id, table in keyword_tables.items():
+            for phrase, weight in table.items():
+                tokens = tuple(tokenize(phrase))
+                if not tokens:
+                    continue
+                if tokens not in phrase_ids:
+                    phrase_ids[tokens] = len(self.phrases)
+                    self.phrases.append([])
+                    self._insert(tokens, phrase_ids[tokens])
+                self.phrases[phrase_ids[tokens]].append((question_id, phrase, weight))
+
+        self._build_failure_links()
+
+    # Function to add one phrase's token path to the trie
+    def _insert(self, tokens, phrase_id):
+        state = 0
+        for token in tokens:
+            if token not in self.goto[state]:
+                self.goto.append({})
+                self.outputs.append([])
+                self.goto[state][token] = len(self.goto) - 1
+            state = self.goto[state][token]
+        self.outputs[state].append(phrase_id)
+
+    # Function to compute failure links breadth-first, folding each state's suffix matches into its outputs
+    def _build_failure_links(self):
+        self.fail = [0] * len(self.goto)
+        # Depth-one states fail back to the root
+        pending = deque(self.goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for token, child in self.goto[state].items():
+                self.fail[child] = self.step(self.fail[state], token)
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+                pending.append(child)
+
+    # Function to advance the automaton by one token
+    def step(self, state, token):
+        while state and token not in self.goto[state]:
+            state = self.fail[state]
+        return self.goto[state].get(token, 0)
+
+    # Function to find the ids of every phrase that occurs in a token sequence
+    def find(self, tokens):
+        found = set()
+        state = 0
+        for token in tokens:
+            state = self.step(state, token)
+            found.update(self.outputs[state])
+        return found
+
+    # Function to list the matched phrases of each question
+    def matches(self, text):
+        matched = {question_id: [] for question_id in self.totals}
+        for phrase_id in self.find(tokenize(text)):
+            for question_id, phrase, _ in self.phrases[phrase_id]:
+                matched[question_id].append(phrase)
+        return matched
+
+    # Function to score an answer against every question at once: matched weight as a percentage of the total
+    def score_all(self, text):
+        matched = {question_id: 0 for question_id in self.totals}
+        for phrase_id in self.find(tokenize(text)):
+            for question_id, _, weight in self.phrases[phrase_id]:
+                matched[question_id] += weight
+        return {
+            question_id: round(matched[question_id] / total * 100, 2) if total else 0.0
+            for question_id, total in self.totals.items()
+        }
+
+    # Function to score an answer against one question
+    def score(self, question_id, text):
+        return self.score_tokens(question_id, tokenize(text))
+
+    # Function to score already tokenised words against one question
+    def score_tokens(self, question_id, tokens):
+        return self.score_phrases(question_id, self.find(tokens))
+
+    # Function to score a set of found phrase ids against one question
+    def score_phrases(self, question_id, phrase_ids):
+        total = self.totals[question_id]
+        matched = sum(
+            weight
+            for phrase_id in phrase_ids
+            for owner, _, weight in self.phrases[phrase_id]
+            if owner == question_id
+        )
+        return round(matched / total * 100, 2) if total else 0.0
@@ -0,0 +1,252 @@
+import threading
+import time
+import traceback
+from collections import Counter
+import numpy as np
+from audio_features import SPEECH_SAMPLE_RATE
+from keyword_matcher import tokenize
+from reference_index import encode_answers
+from streaming_recorder import StreamingConfidence
+from transcription import get_backend, TranscriptionError
+
+# Target time for one live update, partial transcription included. Scoring gets what the
+# transcription left over (at least one new window); a slow decode can still overrun it.
+LATENCY_BUDGET_MS = 300
+# Words per embedding window; only windows touched by new or revised words are re-embedded
+WINDOW_WORDS = 24
+
+# Function to count how many leading items two sequences share
+def common_prefix_length(old, new):
+    limit = min(len(old), len(new))
+    for i in range(limit):
+        if old[i] != new[i]:
+            return i
+    return limit
+
+# Keyword coverage that follows a growing transcript. The automaton state after every token is
+# kept, so a revised tail rewinds to the last unchanged token instead of rescanning the answer.
+class IncrementalKeywords:
+    def __init__(self, matcher, question_id):
+        self.matcher = matcher
+        self.question_id = question_id
+        self.tokens = []
+        self.states = [0]  # states[i] = automaton state after the first i tokens
+        self.found_at = []  # phrase ids completed at each token
+        self.found = Counter()
+
+    # Function to bring the matcher in line with the latest transcript tokens
+    def update(self, tokens):
+        keep = common_prefix_length(self.tokens, tokens)
+        for phrase_ids in self.found_at[keep:]:
+            self.found.subtract(phrase_ids)
+        del self.tokens[keep:], self.states[keep + 1:], self.found_at[keep:]
+
+        state = self.states[-1]
+        for token in tokens[keep:]:
+            state = self.matcher.step(state, token)
+            phrase_ids = self.matcher.outputs[state]
+            self.tokens.append(token)
+            self.states.append(state)
+            self.found_at.append(phrase_ids)
+            self.found.update(phrase_ids)
+        return len(tokens) - keep
+
+    # Weighted keyword coverage of the transcript so far, in percent
+    @property
+    def score(self):
+        return self.matcher.score_phrases(self.question_id, [phrase_id for phrase_id, count in self.found.items() if count > 0])
+
+# Similarity of a growing transcript to one question's references. The transcript is cut into
+# fixed word windows; the answer vector is the word-weighted mean of the window embeddings, so
+# only the windows that changed since the last update go through the encoder.
+class IncrementalSimilarity:
+    def __init__(self, model, reference_embeddings, window_words=WINDOW_WORDS):
+        self.model = model
+        self.reference_embeddings = reference_embeddings
+        self.window_words = window_words
+        self.words = []
+        self.windows = []  # (window words, embedding) for the leading windows already encoded
+        self.ms_per_window = None  # Running estimate of the encoder cost of one window
+
+    # Function to update the windows; encodes pending windows while the time left allows (at least one per call)
+    def update(self, words, time_left_ms):
+        keep = common_prefix_length(self.words, words) // self.window_words
+        # A window survives only if it is complete and unchanged
+        self.windows = [window for window in self.windows[:keep] if len(window[0]) == self.window_words]
+        self.words = list(words)
+
+        pending = [
+            tuple(words[start:start + self.window_words])
+            for start in range(len(self.windows) * self.window_words, len(words), self.window_words)
+        ]
+        affordable = len(pending)
+        if self.ms_per_window:
+            affordable = max(1, min(len(pending), int(time_left_ms // self.ms_per_window)))
+        batch = pending[:affordable]
+        if batch:
+            start = time.perf_counter()
+            embeddings = encode_answers(self.model, [" ".join(window) for window in batch])
+            cost = (time.perf_counter() - start) * 1000 / len(batch)
+            self.ms_per_window = cost if self.ms_per_window is None else 0.8 * self.ms_per_window + 0.2 * cost
+            self.windows.extend(zip(batch, embeddings))
+        return len(pending) - len(batch)
+
+    # Similarity of the encoded part of the transcript, in percent
+    @property
+    def score(self):
+        if not self.windows:
+            return 0.0
+        weights = np.array([len(window) for window, _ in self.windows], dtype=np.float32)
+        answer = (weights[:, None] * np.stack([embedding for _, embedding in self.windows])).sum(axis=0)
+        norm = np.linalg.norm(answer)
+        if not norm:
+            return 0.0
+        return round(float((self.reference_embeddings @ (answer / norm)).max()) * 100, 2)
+
+# Live scores of one answer: similarity, keyword coverage and confidence, updated from partial
+# transcripts and audio chunks within a per-update scoring budget
+class LiveScorer:
+    def __init__(self, question_id, model, reference_embeddings, keyword_matcher=None,
+                 window_words=WINDOW_WORDS, latency_budget_ms=LATENCY_BUDGET_MS, samplerate=SPEECH_SAMPLE_RATE):
+        self.latency_budget_ms = latency_budget_ms
+        self.similarity = IncrementalSimilarity(model, reference_embeddings[question_id], window_words)
+        self.keywords = IncrementalKeywords(keyword_matcher, question_id) if keyword_matcher is not None else None
+        self.confidence = StreamingConfidence(samplerate)
+        self._lock = threading.Lock()
+        self.latest = {"similarity": 0.0, "keyword_coverage": None, "confidence": 0, "words": 0, "pending_windows": 0, "latency_ms": 0.0}
+
+    # Function to feed an audio chunk to the online confidence score
+    def add_audio(self, chunk):
+        with self._lock:
+            self.confidence.update(chunk)
+
+    # Function to score the latest partial transcript and return the published scores.
+    # budget_ms is the time left for scoring (the whole latency budget by default).
+    def update_transcript(self, text, budget_ms=None):
+        budget_ms = self.latency_budget_ms if budget_ms is None else budget_ms
+        start = time.perf_counter()
+        with self._lock:
+            if self.keywords is not None:
+                self.keywords.update(tokenize(text))
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            pending = self.similarity.update(text.split(), budget_ms - elapsed_ms)
+            self.latest = {
+                "similarity": self.similarity.score,
+                "keyword_coverage": None if self.keywords is None else self.keywords.score,
+                "confidence": self.confidence.score,
+                "words": len(self.similarity.words),
+                # Windows left for the next update because the budget ran out
+                "pending_windows": pending,
+                "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+            }
+            return dict(self.latest)
+
+    # Function to read the last published scores
+    def snapshot(self):
+        with self._lock:
+            return dict(self.latest, confidence=self.confidence.score)
+
+
+# Partial transcripts of a recording in progress. Words that ended more than `stable_seconds`
+# before the end of the audio are committed and never decoded again; only the audio after the
+# last committed word is re-transcribed, so the tail may still be revised. Backends without
+# word timestamps fall back to transcribing the whole recording each time.
+class PartialTranscriber:
+    def __init__(self, backend=None, stable_seconds=1.0):
+        self.backend = get_backend(backend)
+        self.stable_seconds = stable_seconds
+        self.committed = []
+        self.committed_until = 0.0
+
+    # Function to check the backend can run before a session relies on it
+    def check(self):
+        self.backend.check()
+
+    # Function to transcribe everything recorded so far and return the full partial transcript
+    def update(self, samples, samplerate):
+        offset = self.committed_until
+        transcript = self.backend.transcribe(samples[int(offset * samplerate):], samplerate)
+        if not transcript.words:
+            return " ".join([word for word, _, _ in self.committed] + [transcript.text]).strip()
+
+        audio_end = len(samples) / samplerate
+        words = [(word, start + offset, end + offset) for word, start, end in transcript.words]
+        tentative = []
+        for word in words:
+            if not tentative and word[2] <= audio_end - self.stable_seconds:
+                self.committed.append(word)
+            else:
+                tentative.append(word)
+        if self.committed:
+            self.committed_until = self.committed[-1][2]
+        return " ".join(word for word, _, _ in self.committed + tentative)
+
+# Background loop that turns the audio recorded so far into live scores every `interval` seconds.
+# Chunks arrive from the recorder thread; a slow transcription simply skips to the newest audio.
+# A failing step is reported in `error` and the loop keeps going; the final scores do not depend on it.
+class LiveSession:
+    def __init__(self, scorer, samplerate, transcriber=None, interval=1.0, on_update=None):
+        self.scorer = scorer
+        self.samplerate = samplerate
+        self.transcriber = transcriber or PartialTranscriber()
+        self.interval = interval
+        self.on_update = on_update
+        self._chunks = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.error = None
+
+    # Function passed to the recorder as on_chunk(samples, confidence)
+    def add_chunk(self, samples, confidence=None):
+        with self._lock:
+            self._chunks.append(samples)
+        self.scorer.add_audio(samples)
+
+    # Function to score the audio recorded so far once
+    def step(self):
+        with self._lock:
+            if not self._chunks:
+                return None
+            samples = np.concatenate(self._chunks)
+            self._chunks = [samples]
+        start = time.perf_counter()
+        try:
+            text = self.transcriber.update(samples, self.samplerate)
+        except TranscriptionError:
+            return None
+        transcription_ms = (time.perf_counter() - start) * 1000
+        # The transcription's share of the budget is taken out of the scoring budget
+        scores = self.scorer.update_transcript(text, self.scorer.latency_budget_ms - transcription_ms)
+        scores["transcript"] = text
+        scores["transcription_ms"] = round(transcription_ms, 1)
+        scores["scoring_ms"] = scores["latency_ms"]
+        scores["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        if self.on_update is not None:
+            self.on_update(scores)
+        return scores
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.step()
+            except Exception as e:
+                # Report the first failure of a kind and keep scoring the following audio
+                error = f"{type(e).__name__}: {e}"
+                if error != self.error:
+                    print(f"Live scoring step failed: {error}")
+                    traceback.print_exc()
+                self.error = error
+
+    # Function to start the background loop; raises TranscriptionError if the backend cannot run
+    def start(self):
+        self.transcriber.check()
+        self._thread = threading.Thread(target=self._run, name="live-scoring", daemon=True)
+        self._thread.start()
+        return self
+
+    # Function to stop the loop and wait for the current step to finish
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
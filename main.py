@@ -1,62 +1,42 @@
-import speech_recognition as sr
-from collections import Counter
+from transcription import transcribe_audio_data, TranscriptionError
+from question_bank import load_question_bank
+from keyword_matcher import KeywordMatcher
+from text_analysis import analyze_text
 
-# Predefined data: HR interview questions and weighted keywords
-questions = {
-    1: "Tell me about yourself.",
-    2: "What are your strengths?",
-    3: "Why do you want to work here?"
-}
+# HR interview questions and weighted keywords, loaded from the question bank file
+question_bank = load_question_bank()
+questions = question_bank.questions
+predefined_keywords = question_bank.keywords
 
-# Predefined answers with keywords and their weights
-predefined_keywords = {
-    1: {"experience": 2, "skills": 2, "background": 1, "passion": 1},
-    2: {"communication": 3, "leadership": 3, "problem-solving": 2, "teamwork": 2},
-    3: {"culture": 2, "growth": 3, "values": 1, "mission": 2}
-}
+# Keyword tables of all questions compiled once; an answer is scanned in a single pass
+keyword_matcher = KeywordMatcher(predefined_keywords)
 
 # Preprocessing: Tokenization and cleaning
 def preprocess(text):
-    # Lowercase and split text into words
-    return text.lower().replace(".", "").split()
+    # Lowercase words from the shared text analysis; hyphens and punctuation split words the same way the keywords are split
+    return analyze_text(text).words
 
 # Scoring function
 def calculate_score(question_id, user_answer):
-    # Preprocess user answer
-    user_tokens = preprocess(user_answer)
-    
-    # Get predefined keywords and weights
-    keywords = predefined_keywords[question_id]
-    
-    # Count keyword matches
-    match_counts = Counter(user_tokens)
-    matched_score = 0
-    total_possible_score = sum(keywords.values())
-    
-    # Calculate weighted score
-    for word, weight in keywords.items():
-        if word in match_counts:
-            matched_score += weight  # Add weight of matched keyword
-    
-    # Calculate percentage score
-    percentage_score = (matched_score / total_possible_score) * 100
-    return round(percentage_score, 2)
+    # Weighted share of the question's keywords and phrases found in the answer
+    return analyze_text(user_answer).keyword_score(keyword_matcher, question_id)
 
 # Function to capture and transcribe audio
 def get_audio_input():
+    import speech_recognition as sr
     recognizer = sr.Recognizer()
     with sr.Microphone() as source:
         print("Listening... Please answer the question.")
         try:
             audio = recognizer.listen(source, timeout=10)  # 10 seconds to answer
             print("Processing your answer...")
-            text = recognizer.recognize_google(audio)  # Using Google STT
+            text = transcribe_audio_data(audio).text  # Google STT or the local engine (STT_BACKEND)
+            if not text:
+                print("Sorry, I couldn't understand your answer. Please try again.")
+                return ""
             print(f"Your Answer: {text}\n")
             return text
-        except sr.UnknownValueError:
-            print("Sorry, I couldn't understand your answer. Please try again.")
-            return ""
-        except sr.RequestError as e:
+        except TranscriptionError as e:
             print(f"Error with the speech recognition service: {e}")
             return ""
 
@@ -0,0 +1,112 @@
+import os
+import threading
+import time
+
+try:
+    import psutil
+except ImportError:  # psutil is only needed for the memory report
+    psutil = None
+
+# Model names shared by every module that loads these models
+SENTENCE_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+EMOTION_MODEL_NAME = "j-hartmann/emotion-english-distilroberta-base"
+
+# CPU inference mode of the sentence and emotion models: fp32, int8 or onnx (see quantized_inference.py)
+INFERENCE_MODES = ("fp32", "int8", "onnx")
+INFERENCE_MODE = os.environ.get("INFERENCE_MODE", "fp32")
+# Id of the sentence encoder in caches; quantized modes produce slightly different vectors, so they get their own entries
+SENTENCE_MODEL_ID = SENTENCE_MODEL_NAME if INFERENCE_MODE == "fp32" else f"{SENTENCE_MODEL_NAME}@{INFERENCE_MODE}"
+
+# Function to read the resident memory of this process in bytes
+def resident_memory():
+    if psutil is None:
+        return None
+    return psutil.Process(os.getpid()).memory_info().rss
+
+# Registry that loads each model lazily, exactly once per process
+class ModelRegistry:
+    def __init__(self):
+        self._loaders = {}
+        self._models = {}
+        self._stats = {}
+        self._locks = {}
+        self._registry_lock = threading.Lock()
+
+    # Function to register a loader without running it
+    def register(self, name, loader):
+        with self._registry_lock:
+            self._loaders[name] = loader
+            self._locks.setdefault(name, threading.Lock())
+
+    # Function to return a loaded model, loading it on first use
+    def get(self, name):
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        if name not in self._loaders:
+            raise KeyError(f"Unknown model: {name}")
+        with self._locks[name]:
+            # Another thread may have finished loading while we waited for the lock
+            if name not in self._models:
+                rss_before = resident_memory()
+                start = time.perf_counter()
+                self._models[name] = self._loaders[name]()
+                rss_after = resident_memory()
+                self._stats[name] = {
+                    "load_seconds": round(time.perf_counter() - start, 3),
+                    "rss_delta_mb": None if rss_before is None else round((rss_after - rss_before) / 2**20, 1),
+                }
+        return self._models[name]
+
+    # Function to eagerly load models at startup instead of on the first request
+    def warm_up(self, names=None):
+        for name in names or list(self._loaders):
+            self.get(name)
+        return self.report()
+
+    # Function to report per-model load time and memory for every loaded model
+    def report(self):
+        rss = resident_memory()
+        return {
+            "models": {name: dict(stats) for name, stats in self._stats.items()},
+            "process_rss_mb": None if rss is None else round(rss / 2**20, 1),
+            "inference_mode": INFERENCE_MODE,
+        }
+
+    # Function to check whether a model has already been loaded
+    def is_loaded(self, name):
+        return name in self._models
+
+
+# Loaders import their libraries lazily so unused models cost nothing
+def load_sentence_encoder():
+    from quantized_inference import load_sentence_encoder
+    return load_sentence_encoder(INFERENCE_MODE)
+
+def load_emotion_classifier():
+    from quantized_inference import load_emotion_classifier
+    return load_emotion_classifier(INFERENCE_MODE)
+
+def load_grammar_tool():
+    from grammar_pool import LanguageToolPool
+    # One server is started here, so warming the registry up also pays the JVM start-up
+    return LanguageToolPool(size=int(os.environ.get("GRAMMAR_POOL_SIZE", "2")), language="en-US").start()
+
+def load_sentiment_analyzer():
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    return SentimentIntensityAnalyzer()
+
+
+# Process-wide registry used by every analyzer
+registry = ModelRegistry()
+registry.register("sentence_encoder", load_sentence_encoder)
+registry.register("emotion", load_emotion_classifier)
+registry.register("grammar", load_grammar_tool)
+registry.register("sentiment", load_sentiment_analyzer)
+
+# Function to print the load report in the same style as the interview summaries
+def print_report(report):
+    print("\nModel Load Report:")
+    for name, stats in report["models"].items():
+        print(f" - {name}: {stats['load_seconds']}s, +{stats['rss_delta_mb']} MB")
+    print(f"Process RSS: {report['process_rss_mb']} MB (inference mode: {report['inference_mode']})\n")
@@ -1,12 +1,15 @@
-from pyAudioAnalysis import audioFeatureExtraction
+from vad import analyze_pauses
 
+# Pause Duration Analysis: total time of the pauses between the first and last speech, in seconds
 def pacing_and_pause(audio_file):
-    [fs, signal] = audioFeatureExtraction.read_audio_file(audio_file)
-    features, _ = audioFeatureExtraction.stFeatureExtraction(signal, fs, 0.050, 0.025)
-    pause_duration = np.sum(features[2] < 0.02)  # Detecting pauses based on energy threshold
-    return pause_duration
+    # Pauses between speech, from the vectorised energy/ZCR voice activity detector
+    return round(analyze_pauses(audio_file).total_pause, 2)
 
-# Example usage
-audio_file = 'path_to_audio.wav'
-pause_duration = pacing_and_pause(audio_file)
-print(f"Pause Duration (in frames): {pause_duration}")
+if __name__ == "__main__":
+    # Example usage
+    audio_file = 'path_to_audio.wav'
+    pauses = analyze_pauses(audio_file)
+    print(f"Pause Duration (seconds): {pacing_and_pause(audio_file):.2f}")
+    print(f"Longest Pause (seconds): {pauses.longest_pause:.2f}")
+    for start, end in pauses.pause_segments:
+        print(f" - pause from {start:.2f}s to {end:.2f}s")
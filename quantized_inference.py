@@ -0,0 +1,155 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+from model_registry import SENTENCE_MODEL_NAME, EMOTION_MODEL_NAME, INFERENCE_MODES, INFERENCE_MODE, resident_memory
+
+# CPU inference modes for the sentence encoder and the emotion classifier:
+#   fp32 - the original PyTorch models
+#   int8 - PyTorch with the Linear layers dynamically quantized to int8
+#   onnx - the models exported to ONNX and run with ONNX Runtime (needs optimum[onnxruntime])
+
+# Exported ONNX models are kept here, so the export runs once per machine rather than once per process
+ONNX_CACHE_DIR = os.environ.get("ONNX_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "onnx"))
+
+# Function to check an inference mode name
+def check_mode(mode):
+    if mode not in INFERENCE_MODES:
+        raise ValueError(f"Unknown inference mode: {mode} (choose from {', '.join(INFERENCE_MODES)})")
+    return mode
+
+# Function to quantize the Linear layers of a PyTorch model to int8 (weights int8, activations quantized on the fly)
+def quantize_linear_layers(model):
+    import torch
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+# Function to load the sentence encoder in the given inference mode
+def load_sentence_encoder(mode=INFERENCE_MODE):
+    from sentence_transformers import SentenceTransformer
+    check_mode(mode)
+    if mode == "onnx":
+        return SentenceTransformer(SENTENCE_MODEL_NAME, device="cpu", backend="onnx")
+    model = SentenceTransformer(SENTENCE_MODEL_NAME, device="cpu")
+    if mode == "int8":
+        model = quantize_linear_layers(model)
+    return model
+
+# Function to export a Hugging Face classifier to ONNX once and return the directory it was saved to
+def export_onnx_classifier(model_name):
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+    export_dir = os.path.join(ONNX_CACHE_DIR, model_name.replace("/", "--"))
+    if not os.path.exists(os.path.join(export_dir, "model.onnx")):
+        os.makedirs(ONNX_CACHE_DIR, exist_ok=True)
+        # Export into a temporary directory and move it into place, so concurrent workers never load a partial export
+        staging = tempfile.mkdtemp(dir=ONNX_CACHE_DIR)
+        try:
+            ORTModelForSequenceClassification.from_pretrained(model_name, export=True).save_pretrained(staging)
+            try:
+                os.rename(staging, export_dir)
+            except OSError:
+                pass  # Another process finished the same export first
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+    return export_dir
+
+# Function to load the emotion classification pipeline in the given inference mode
+def load_emotion_classifier(mode=INFERENCE_MODE):
+    from transformers import AutoTokenizer, pipeline
+    check_mode(mode)
+    if mode == "fp32":
+        return pipeline("text-classification", model=EMOTION_MODEL_NAME)
+    tokenizer = AutoTokenizer.from_pretrained(EMOTION_MODEL_NAME)
+    if mode == "onnx":
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+        model = ORTModelForSequenceClassification.from_pretrained(export_onnx_classifier(EMOTION_MODEL_NAME))
+    else:
+        from transformers import AutoModelForSequenceClassification
+        model = quantize_linear_layers(AutoModelForSequenceClassification.from_pretrained(EMOTION_MODEL_NAME))
+    return pipeline("text-classification", model=model, tokenizer=tokenizer)
+
+
+# Function to time a call and measure how much resident memory it added
+def timed_load(loader, mode):
+    rss_before = resident_memory()
+    start = time.perf_counter()
+    model = loader(mode)
+    seconds = time.perf_counter() - start
+    rss_after = resident_memory()
+    return model, round(seconds, 2), None if rss_before is None else round((rss_after - rss_before) / 2**20, 1)
+
+# Function to measure the median per-call latency of a function over the texts
+def median_latency_ms(function, texts, repeats=3):
+    latencies = []
+    for _ in range(repeats):
+        for text in texts:
+            start = time.perf_counter()
+            function(text)
+            latencies.append(time.perf_counter() - start)
+    return round(float(np.median(latencies)) * 1000, 2)
+
+# Function to compare a mode against fp32 on a reference set of answers.
+# Similarity drift is measured on the answer-to-answer similarity matrix, in score points (0-100);
+# emotion drift is label agreement and the change in the top label's score.
+def parity_report(texts, mode):
+    check_mode(mode)
+    report = {"mode": mode, "texts": len(texts)}
+
+    baseline, baseline_load, baseline_mb = timed_load(load_sentence_encoder, "fp32")
+    candidate, candidate_load, candidate_mb = timed_load(load_sentence_encoder, mode)
+    reference = baseline.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+    embeddings = candidate.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+    drift = np.abs(embeddings @ embeddings.T - reference @ reference.T) * 100
+    report["sentence_encoder"] = {
+        "embedding_cosine_min": round(float(np.min(np.sum(reference * embeddings, axis=1))), 4),
+        "similarity_drift_mean": round(float(drift.mean()), 3),
+        "similarity_drift_max": round(float(drift.max()), 3),
+        "fp32_ms": median_latency_ms(lambda text: baseline.encode(text), texts),
+        f"{mode}_ms": median_latency_ms(lambda text: candidate.encode(text), texts),
+        "fp32_load": {"seconds": baseline_load, "rss_mb": baseline_mb},
+        f"{mode}_load": {"seconds": candidate_load, "rss_mb": candidate_mb},
+    }
+    del baseline, candidate
+
+    baseline, baseline_load, baseline_mb = timed_load(load_emotion_classifier, "fp32")
+    candidate, candidate_load, candidate_mb = timed_load(load_emotion_classifier, mode)
+    reference = baseline(texts, truncation=True)
+    predictions = candidate(texts, truncation=True)
+    score_drift = [abs(r["score"] - p["score"]) for r, p in zip(reference, predictions) if r["label"] == p["label"]]
+    report["emotion"] = {
+        "label_agreement": round(sum(r["label"] == p["label"] for r, p in zip(reference, predictions)) / len(texts), 3),
+        "score_drift_max": round(float(max(score_drift, default=0.0)), 4),
+        "fp32_ms": median_latency_ms(lambda text: baseline(text), texts),
+        f"{mode}_ms": median_latency_ms(lambda text: candidate(text), texts),
+        "fp32_load": {"seconds": baseline_load, "rss_mb": baseline_mb},
+        f"{mode}_load": {"seconds": candidate_load, "rss_mb": candidate_mb},
+    }
+    return report
+
+# Function to print a parity report
+def print_parity_report(report):
+    print(f"\nParity of {report['mode']} against fp32 on {report['texts']} answers:")
+    for model_name in ("sentence_encoder", "emotion"):
+        print(f" {model_name}:")
+        for name, value in report[model_name].items():
+            print(f"  - {name}: {value}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare an int8 or ONNX inference mode against fp32.")
+    parser.add_argument("--mode", default="int8", choices=[mode for mode in INFERENCE_MODES if mode != "fp32"])
+    parser.add_argument("--texts", help="file with one reference answer per line (default: every answer in the question bank)")
+    parser.add_argument("--max-drift", type=float, default=2.0, help="fail if the similarity drift exceeds this many points")
+    args = parser.parse_args()
+
+    if args.texts:
+        with open(args.texts, encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+    else:
+        from question_bank import load_question_bank
+        texts = [answer for answers in load_question_bank().predefined_answers.values() for answer in answers]
+
+    report = parity_report(texts, args.mode)
+    print_parity_report(report)
+    if report["sentence_encoder"]["similarity_drift_max"] > args.max_drift:
+        raise SystemExit(f"Similarity drift above {args.max_drift} points")
@@ -0,0 +1,40 @@
+import json
+import os
+from functools import lru_cache
+
+# Default bank shipped with the project; set QUESTION_BANK to use another file
+DEFAULT_BANK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "question_bank.json")
+
+# Interview questions with their example answers and weighted keywords, keyed by question id
+class QuestionBank:
+    def __init__(self, entries):
+        self.questions = {}
+        self.predefined_answers = {}
+        self.keywords = {}
+        for entry in entries:
+            question_id = int(entry["id"])
+            if question_id in self.questions:
+                raise ValueError(f"Duplicate question id {question_id} in the question bank")
+            answers = list(entry.get("answers", []))
+            # Similarity takes the best match over a question's answers, so every question needs one
+            if not answers:
+                raise ValueError(f"Question {question_id} has no example answers in the question bank")
+            self.questions[question_id] = entry["question"]
+            self.predefined_answers[question_id] = answers
+            self.keywords[question_id] = dict(entry.get("keywords", {}))
+
+    # Function to read a bank from a JSON file ({"questions": [...]}) or a JSON Lines file (one question per line)
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding="utf-8") as f:
+            if path.endswith(".jsonl"):
+                return cls(json.loads(line) for line in f if line.strip())
+            return cls(json.load(f)["questions"])
+
+    def __len__(self):
+        return len(self.questions)
+
+# Function to load the question bank once per path
+@lru_cache(maxsize=None)
+def load_question_bank(path=None):
+    return QuestionBank.from_file(path or os.environ.get("QUESTION_BANK", DEFAULT_BANK_PATH))
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import numpy as np
+from embedding_cache import embedding_cache
+from model_registry import SENTENCE_MODEL_ID
+
+# Directory where precomputed reference embeddings are stored
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+# Function to hash the model name and answer texts so stale indexes are never reused
+def index_key(model_name, predefined_answers):
+    payload = json.dumps(
+        {"model": model_name, "answers": [[str(qid), predefined_answers[qid]] for qid in sorted(predefined_answers)]},
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+# Function to compute the row range of every question inside the embedding matrix
+def question_offsets(predefined_answers):
+    offsets = {}
+    start = 0
+    for qid in sorted(predefined_answers):
+        end = start + len(predefined_answers[qid])
+        offsets[qid] = (start, end)
+        start = end
+    return offsets
+
+# Banks smaller than this are searched exhaustively; larger ones through the IVF lists
+MIN_IVF_SIZE = 4096
+# Number of IVF lists probed per query
+DEFAULT_NPROBE = 8
+
+# Function to write an array atomically so a crash never leaves a truncated file behind
+def save_atomic(path, array):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, np.ascontiguousarray(array))
+    os.replace(tmp_path, path)
+
+# Function to cluster unit vectors with spherical k-means (cosine assignment, normalised means)
+def spherical_kmeans(matrix, nlist, iterations=10, chunk_size=8192, seed=0):
+    rng = np.random.default_rng(seed)
+    centroids = np.array(matrix[rng.choice(len(matrix), nlist, replace=False)], dtype=np.float32)
+    assignments = np.zeros(len(matrix), dtype=np.int32)
+    for _ in range(iterations):
+        # Assign in chunks so the score matrix stays small for large banks
+        for start in range(0, len(matrix), chunk_size):
+            assignments[start:start + chunk_size] = np.argmax(matrix[start:start + chunk_size] @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, matrix)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        # Empty lists are re-seeded with a random reference
+        empty = norms[:, 0] == 0
+        sums[empty] = matrix[rng.choice(len(matrix), int(empty.sum()))]
+        norms[empty] = 1.0
+        centroids = sums / norms
+    return centroids, assignments
+
+# L2-normalised embeddings of every reference answer, memory-mapped from the cache.
+# Rows are grouped by question, so scoring against one question's references is a slice.
+# An IVF index (k-means centroids and one inverted list per centroid) over all rows
+# answers "which question does this answer address" by probing a few lists instead of
+# scanning the whole bank.
+class ReferenceIndex:
+    def __init__(self, matrix, offsets, centroids=None, order=None, list_offsets=None):
+        self.matrix = matrix
+        self.offsets = offsets
+        self.labels = np.empty(len(matrix), dtype=np.int64)
+        for qid, (start, end) in offsets.items():
+            self.labels[start:end] = qid
+        self.centroids = centroids
+        self.order = order
+        self.list_offsets = list_offsets
+
+    # Reference embeddings of one question
+    def __getitem__(self, qid):
+        start, end = self.offsets[qid]
+        return self.matrix[start:end]
+
+    def __contains__(self, qid):
+        return qid in self.offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    # Function to find candidate rows for a query: rows in the nprobe closest lists, or every row for small banks
+    def candidates(self, embedding, nprobe=DEFAULT_NPROBE):
+        if self.centroids is None:
+            return np.arange(len(self.matrix))
+        nprobe = min(nprobe, len(self.centroids))
+        probed = np.argpartition(-(self.centroids @ embedding), nprobe - 1)[:nprobe]
+        return np.concatenate([self.order[self.list_offsets[i]:self.list_offsets[i + 1]] for i in probed])
+
+    # Function to return the k nearest references as (row, question id, cosine similarity)
+    def search(self, embedding, k=1, nprobe=DEFAULT_NPROBE):
+        embedding = np.asarray(embedding, dtype=np.float32)
+        rows = self.candidates(embedding, nprobe)
+        if len(rows) == 0:
+            return []
+        # Read the candidate rows in file order for better locality on the memory map
+        rows = np.sort(rows)
+        scores = self.matrix[rows] @ embedding
+        top = np.argsort(-scores)[:k]
+        return [(int(rows[i]), int(self.labels[rows[i]]), float(scores[i])) for i in top]
+
+    # Function to guess which question an answer addresses from its nearest reference answer
+    def infer_question(self, embedding, nprobe=DEFAULT_NPROBE):
+        nearest = self.search(embedding, k=1, nprobe=nprobe)
+        if not nearest:
+            return None, 0.0
+        _, qid, score = nearest[0]
+        return qid, score
+
+# Function to load (or build once) the IVF lists over the reference matrix
+def load_ivf(matrix, key, cache_dir):
+    nlist = int(np.sqrt(len(matrix)))
+    centroids_path = os.path.join(cache_dir, f"ivf_{key}_{nlist}_centroids.npy")
+    order_path = os.path.join(cache_dir, f"ivf_{key}_{nlist}_order.npy")
+    offsets_path = os.path.join(cache_dir, f"ivf_{key}_{nlist}_offsets.npy")
+
+    if not os.path.exists(offsets_path):
+        centroids, assignments = spherical_kmeans(matrix, nlist)
+        order = np.argsort(assignments, kind="stable")
+        list_offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=nlist))])
+        save_atomic(centroids_path, centroids.astype(np.float32))
+        save_atomic(order_path, order.astype(np.int64))
+        # Written last: its presence means the other two files are complete
+        save_atomic(offsets_path, list_offsets.astype(np.int64))
+
+    return np.load(centroids_path), np.load(order_path, mmap_mode="r"), np.load(offsets_path)
+
+# Function to load (or build once) the L2-normalised reference embeddings for every question
+def load_reference_index(model, model_name, predefined_answers, cache_dir=CACHE_DIR):
+    os.makedirs(cache_dir, exist_ok=True)
+    key = index_key(model_name, predefined_answers)
+    matrix_path = os.path.join(cache_dir, f"reference_{key}.npy")
+
+    if not os.path.exists(matrix_path):
+        texts = [answer for qid in sorted(predefined_answers) for answer in predefined_answers[qid]]
+        embeddings = model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+        save_atomic(matrix_path, np.asarray(embeddings, dtype=np.float32))
+
+    # Memory-map the matrix so every process shares the same pages
+    matrix = np.load(matrix_path, mmap_mode="r")
+    offsets = question_offsets(predefined_answers)
+    if len(matrix) < MIN_IVF_SIZE:
+        return ReferenceIndex(matrix, offsets)
+    return ReferenceIndex(matrix, offsets, *load_ivf(matrix, key, cache_dir))
+
+# Function to embed answers with the sentence encoder, encoding only texts not already in the embedding cache
+def encode_answers(model, texts, model_id=SENTENCE_MODEL_ID, batch_size=None):
+    def encode(missing):
+        return model.encode(missing, batch_size=batch_size or len(missing), convert_to_numpy=True, normalize_embeddings=True)
+    return np.stack(embedding_cache.get_many(f"{model_id}:normalized", texts, encode)).astype(np.float32, copy=False)
+
+# Function to load (or build once) the L2-normalised embeddings of every question text, keyed by the text
+def load_question_embeddings(model, model_name, questions, cache_dir=CACHE_DIR):
+    os.makedirs(cache_dir, exist_ok=True)
+    texts = list(dict.fromkeys(questions[qid] for qid in sorted(questions)))
+    matrix_path = os.path.join(cache_dir, f"questions_{index_key(model_name, {0: texts})}.npy")
+
+    if not os.path.exists(matrix_path):
+        embeddings = model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+        save_atomic(matrix_path, np.asarray(embeddings, dtype=np.float32))
+
+    matrix = np.load(matrix_path, mmap_mode="r")
+    return {text: matrix[row] for row, text in enumerate(texts)}
+
+# Function to score a user answer against the precomputed references with one dot product
+def best_similarity(model, reference_embeddings, user_answer):
+    user_embedding = encode_answers(model, [user_answer])[0]
+    similarity_scores = reference_embeddings @ user_embedding
+    return round(float(similarity_scores.max()) * 100, 2)
+
+# Function to infer which question a user answer addresses, returning (question id, similarity %)
+def infer_question(model, reference_index, user_answer, nprobe=DEFAULT_NPROBE):
+    user_embedding = encode_answers(model, [user_answer])[0]
+    qid, score = reference_index.infer_question(user_embedding, nprobe)
+    return qid, round(score * 100, 2)
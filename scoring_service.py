@@ -0,0 +1,316 @@
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import tornado.web
+import integrated
+import update
+from model_registry import registry
+from embedding_cache import embedding_cache
+from reference_index import encode_answers
+
+DEFAULT_DEADLINE_MS = 5000
+# Directory that /evaluate may read audio_path from; without it audio paths are rejected
+AUDIO_DIR = os.environ.get("SCORING_AUDIO_DIR")
+
+# Raised when a model queue is full; the client should retry later
+class Overloaded(Exception):
+    pass
+
+# Raised when a request's deadline passes before its batch runs
+class DeadlineExceeded(Exception):
+    pass
+
+# Queue in front of one model that coalesces concurrent requests into micro-batches.
+# A batch is sent as soon as it is full or `max_wait_ms` after its first request arrived.
+class MicroBatcher:
+    def __init__(self, name, batch_fn, max_batch_size=32, max_wait_ms=10, max_queue=256):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        # One inference thread per model keeps torch from oversubscribing the CPU
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"batch-{name}")
+        self.batches = 0
+        self.items = 0
+
+    # Function to queue one item and wait for its result until the deadline (loop time)
+    async def submit(self, item, deadline):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        try:
+            self.queue.put_nowait((item, future, deadline))
+        except asyncio.QueueFull:
+            raise Overloaded(f"{self.name} queue is full")
+        try:
+            return await asyncio.wait_for(future, timeout=max(deadline - loop.time(), 0))
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(f"{self.name} did not finish before the deadline")
+
+    # Function to collect the next micro-batch: wait for one item, then up to max_wait for more
+    async def next_batch(self):
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        flush_at = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = flush_at - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    # Background task: run batches forever
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self.next_batch()
+            # Skip requests whose caller already gave up or whose deadline has passed
+            live = []
+            for item, future, deadline in batch:
+                if future.done():
+                    continue
+                if deadline <= loop.time():
+                    future.set_exception(DeadlineExceeded(f"{self.name} deadline passed while queued"))
+                    continue
+                live.append((item, future))
+            if not live:
+                continue
+
+            try:
+                results = await loop.run_in_executor(self.executor, self.batch_fn, [item for item, _ in live])
+            except Exception:
+                # One bad item must not fail the requests batched with it: rerun them one by one
+                results = await loop.run_in_executor(self.executor, self.run_items, [item for item, _ in live])
+            self.batches += 1
+            self.items += len(live)
+            # A batch function returns an exception in place of the result of an item it could not score
+            for (_, future), result in zip(live, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    # Function to run the batch function on each item alone, returning its exception in place of a failed result
+    def run_items(self, items):
+        results = []
+        for item in items:
+            try:
+                results.extend(self.batch_fn([item]))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    # Function to report queue depth and average batch size
+    def stats(self):
+        return {
+            "queued": self.queue.qsize(),
+            "batches": self.batches,
+            "mean_batch_size": round(self.items / self.batches, 2) if self.batches else 0,
+        }
+
+
+# Batch functions, run on each model's inference thread
+# Similarity for a batch of (question_id, answer) pairs: one encoder call, one dot product each.
+# A question id of None means the question is inferred from the nearest reference answer.
+# An unknown question id fails only its own item.
+def similarity_batch(items):
+    answers = [answer for _, answer in items]
+    model, reference_embeddings = update.load_similarity_model()
+    embeddings = encode_answers(model, answers)
+    results = []
+    for (question_id, _), embedding in zip(items, embeddings):
+        if question_id is None:
+            question_id, _ = reference_embeddings.infer_question(embedding)
+        if question_id not in reference_embeddings:
+            results.append(KeyError(question_id))
+            continue
+        similarities = reference_embeddings[question_id] @ embedding
+        score = round(float(similarities.max()) * 100, 2) if len(similarities) else 0.0
+        results.append((question_id, score))
+    return results
+
+# Emotion labels for a batch of texts
+def emotion_batch(texts):
+    return integrated.emotion_recognition_batch(texts, batch_size=len(texts))
+
+# Semantic coherence for a batch of (text, question) pairs
+def coherence_batch(items):
+    texts = [text for text, _ in items]
+    questions = [question for _, question in items]
+    return [float(score) for score in integrated.semantic_coherence_batch(texts, questions, batch_size=len(items))]
+
+
+# Function to make analyzer outputs JSON-serialisable
+def to_json(value):
+    if isinstance(value, dict):
+        return {key: to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json(item) for item in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+# Shared request parsing and error mapping
+class BaseHandler(tornado.web.RequestHandler):
+    # Function to parse the JSON body and the request deadline (loop time)
+    def parse_request(self):
+        try:
+            body = json.loads(self.request.body or b"{}")
+        except json.JSONDecodeError:
+            raise tornado.web.HTTPError(400, reason="Body must be JSON")
+        if not isinstance(body, dict):
+            raise tornado.web.HTTPError(400, reason="Body must be a JSON object")
+        try:
+            deadline_ms = float(body.get("deadline_ms") or self.request.headers.get("X-Deadline-Ms") or DEFAULT_DEADLINE_MS)
+        except (TypeError, ValueError):
+            raise tornado.web.HTTPError(400, reason="deadline_ms must be a number")
+        return body, asyncio.get_running_loop().time() + deadline_ms / 1000
+
+    # Function to run a scoring coroutine and map service errors to HTTP status codes
+    async def respond(self, coroutine):
+        try:
+            self.write(to_json(await coroutine))
+        except Overloaded as e:
+            self.set_status(503)
+            self.set_header("Retry-After", "1")
+            self.write({"error": str(e)})
+        except DeadlineExceeded as e:
+            self.set_status(504)
+            self.write({"error": str(e)})
+        except KeyError as e:
+            self.set_status(400)
+            self.write({"error": f"Missing or unknown field: {e}"})
+        except (TypeError, ValueError) as e:
+            self.set_status(400)
+            self.write({"error": f"Invalid field: {e}"})
+        except PermissionError as e:
+            self.set_status(403)
+            self.write({"error": str(e)})
+
+# Function to read a required text field from the body
+def text_field(body, name):
+    value = body[name]
+    if not isinstance(value, str):
+        raise TypeError(f"{name} must be a string")
+    return value
+
+# Function to parse an optional question id from the body and check it is in the bank
+def parse_question_id(body):
+    if body.get("question_id") is None:
+        return None
+    question_id = int(body["question_id"])
+    if question_id not in update.questions:
+        raise KeyError(question_id)
+    return question_id
+
+# Function to resolve a client audio path; only files inside AUDIO_DIR may be read
+def resolve_audio_path(path):
+    if not path:
+        return None
+    if not AUDIO_DIR:
+        raise PermissionError("audio_path is disabled; set SCORING_AUDIO_DIR to allow it")
+    root = os.path.realpath(AUDIO_DIR)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root or not os.path.isfile(resolved):
+        raise PermissionError(f"audio_path must name a file inside {AUDIO_DIR}")
+    return resolved
+
+# POST /similarity {"answer", "question_id"?, "deadline_ms"?}; without a question id the question is inferred
+class SimilarityHandler(BaseHandler):
+    async def post(self):
+        body, deadline = self.parse_request()
+
+        async def score():
+            question_id = parse_question_id(body)
+            question_id, similarity = await self.application.batchers["similarity"].submit((question_id, text_field(body, "answer")), deadline)
+            return {"question_id": question_id, "similarity": similarity}
+
+        await self.respond(score())
+
+# POST /evaluate {"text", "question", "audio_path"?, "question_id"?, "deadline_ms"?}; audio_path is relative to SCORING_AUDIO_DIR
+class EvaluateHandler(BaseHandler):
+    async def post(self):
+        body, deadline = self.parse_request()
+
+        async def evaluate():
+            text, question = text_field(body, "text"), text_field(body, "question")
+            question_id = parse_question_id(body)
+            audio_path = resolve_audio_path(body.get("audio_path"))
+            batchers = self.application.batchers
+            # The transformer analyzers are micro-batched across requests
+            emotion, coherence = await asyncio.gather(
+                batchers["emotion"].submit(text, deadline),
+                batchers["coherence"].submit((text, question), deadline),
+            )
+            precomputed = {"Emotion": emotion, "Semantic Coherence": coherence}
+            if audio_path is None:
+                precomputed["Pause Duration"] = None
+                precomputed["Pacing"] = None
+            # The remaining analyzers are cheap per request and run on the default executor
+            loop = asyncio.get_running_loop()
+            evaluation = await asyncio.wait_for(
+                loop.run_in_executor(None, lambda: integrated.evaluate_response(text, audio_path, question, precomputed=precomputed)),
+                timeout=max(deadline - loop.time(), 0),
+            )
+            if question_id is not None:
+                _, evaluation["Similarity"] = await batchers["similarity"].submit((question_id, text), deadline)
+            return evaluation
+
+        try:
+            await self.respond(evaluate())
+        except asyncio.TimeoutError:
+            self.set_status(504)
+            self.write({"error": "evaluation did not finish before the deadline"})
+
+# GET /health: queue depths, batch sizes and model load report
+class HealthHandler(tornado.web.RequestHandler):
+    def get(self):
+        self.write({
+            "batchers": {name: batcher.stats() for name, batcher in self.application.batchers.items()},
+            "models": registry.report(),
+            "embedding_cache": embedding_cache.stats(),
+        })
+
+# Function to build the web application and its per-model batchers
+def make_app(max_batch_size=32, max_wait_ms=10, max_queue=256):
+    app = tornado.web.Application([
+        (r"/similarity", SimilarityHandler),
+        (r"/evaluate", EvaluateHandler),
+        (r"/health", HealthHandler),
+    ])
+    app.batchers = {
+        "similarity": MicroBatcher("similarity", similarity_batch, max_batch_size, max_wait_ms, max_queue),
+        "emotion": MicroBatcher("emotion", emotion_batch, max_batch_size, max_wait_ms, max_queue),
+        "coherence": MicroBatcher("coherence", coherence_batch, max_batch_size, max_wait_ms, max_queue),
+    }
+    return app
+
+# Function to start the batchers and the HTTP server
+async def serve(host, port, **batch_options):
+    app = make_app(**batch_options)
+    tasks = [asyncio.create_task(batcher.run()) for batcher in app.batchers.values()]
+    app.listen(port, address=host)
+    print(f"Scoring service listening on http://{host}:{port}")
+    await asyncio.gather(*tasks)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve answer scoring over HTTP with dynamic micro-batching.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=10, help="how long a batch waits for more requests")
+    parser.add_argument("--max-queue", type=int, default=256, help="queued requests per model before returning 503")
+    args = parser.parse_args()
+
+    # Load every model before accepting traffic
+    registry.warm_up(["sentence_encoder", "emotion", "sentiment", "grammar"])
+    update.load_similarity_model()
+    asyncio.run(serve(args.host, args.port, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms, max_queue=args.max_queue))
@@ -1,49 +1,34 @@
-import speech_recognition as sr
-from sentence_transformers import SentenceTransformer, util
+from functools import lru_cache
+from transcription import transcribe_audio_data, TranscriptionError
+from model_registry import registry, SENTENCE_MODEL_ID
+from question_bank import load_question_bank
+from reference_index import load_reference_index, best_similarity
 import time
 
-# Load the Hugging Face model for semantic similarity
-model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
+# Hugging Face model for semantic similarity (loaded on first use, see load_similarity_model)
+MODEL_NAME = SENTENCE_MODEL_ID
 
-# Predefined data: HR interview questions and example answers
-questions = {
-    1: "Tell me about yourself.",
-    2: "What are your strengths?",
-    3: "Why do you want to work here?"
-}
+# HR interview questions and example answers, loaded from the question bank file
+question_bank = load_question_bank()
+questions = question_bank.questions
+predefined_answers = question_bank.predefined_answers
 
-# Predefined answers: multiple examples for each question
-predefined_answers = {
-    1: [
-        "I am a software developer with 5 years of experience, passionate about creating innovative solutions.",
-        "I have a background in finance, with strong analytical skills and a drive to learn new technologies.",
-        "I am a recent graduate in marketing, eager to apply my knowledge in a dynamic environment."
-    ],
-    2: [
-        "My strengths include excellent communication, leadership abilities, and being a proactive team player.",
-        "I excel in problem-solving, adapting to new situations, and maintaining a positive attitude under pressure.",
-        "I am highly organized, detail-oriented, and skilled at managing multiple projects simultaneously."
-    ],
-    3: [
-        "I admire this company's mission to drive innovation and would love to contribute to that vision.",
-        "The opportunity to grow in a company with a strong culture and values aligns with my career goals.",
-        "I am drawn to this company's emphasis on employee development and impactful projects."
-    ]
-}
+# The model and reference embeddings are loaded on first use, once per process
+@lru_cache(maxsize=None)
+def load_similarity_model():
+    model = registry.get("sentence_encoder")
+    # Reference embeddings are computed once and memory-mapped from disk
+    return model, load_reference_index(model, MODEL_NAME, predefined_answers)
 
-# Function to calculate semantic similarity score
-def calculate_similarity(predefined_answers, user_answer):
-    # Encode predefined answers and the user answer
-    predefined_embeddings = model.encode(predefined_answers, convert_to_tensor=True)
-    user_embedding = model.encode(user_answer, convert_to_tensor=True)
-    
-    # Compute similarity scores
-    similarity_scores = util.pytorch_cos_sim(user_embedding, predefined_embeddings)
-    best_score = similarity_scores.max().item() * 100  # Convert to percentage
-    return round(best_score, 2)
+# Function to calculate semantic similarity score against the precomputed reference index.
+# Every entry point (CLI scripts, Streamlit app, bulk scorer, scoring service) uses this one.
+def calculate_similarity(question_id, user_answer, similarity_model=None):
+    model, reference_embeddings = similarity_model or load_similarity_model()
+    return best_similarity(model, reference_embeddings[question_id], user_answer)
 
 # Function to capture and transcribe audio with 30-second time limit
 def get_audio_input():
+    import speech_recognition as sr
     recognizer = sr.Recognizer()
     with sr.Microphone() as source:
         print("Listening... Please answer the question. You have 30 seconds.")
@@ -69,13 +54,13 @@ def get_audio_input():
         print("Processing your answer...")
         try:
             # Transcribe the audio to text
-            text = recognizer.recognize_google(audio)  # Using Google STT
+            text = transcribe_audio_data(audio).text  # Google STT or the local engine (STT_BACKEND)
+            if not text:
+                print("Sorry, I couldn't understand your answer. Please try again.")
+                return ""
             print(f"Your Answer: {text}\n")
             return text
-        except sr.UnknownValueError:
-            print("Sorry, I couldn't understand your answer. Please try again.")
-            return ""
-        except sr.RequestError as e:
+        except TranscriptionError as e:
             print(f"Error with the speech recognition service: {e}")
             return ""
 
@@ -94,11 +79,8 @@ def interview():
             print("No valid answer received. Moving to the next question...\n")
             continue
         
-        # Get predefined answers
-        predefined_set = predefined_answers[question_id]
-        
-        # Calculate similarity score
-        score = calculate_similarity(predefined_set, user_answer)
+        # Calculate similarity score against the predefined answers
+        score = calculate_similarity(question_id, user_answer)
         scores[question_id] = score
         print(f"Your score for this question: {score}%\n")
     
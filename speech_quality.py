@@ -1,15 +1,15 @@
-import librosa
 import numpy as np
+from audio_features import AudioFeatures
 
 def speech_quality(audio_file):
-    y, sr = librosa.load(audio_file)
-    energy = librosa.feature.rms(y=y)
-    zcr = librosa.feature.zero_crossing_rate(y=y)
-    energy_mean = np.mean(energy)
-    zcr_mean = np.mean(zcr)
+    # Decoded once at the native rate; RMS and ZCR come from the shared frames
+    features = AudioFeatures.from_source(audio_file)
+    energy_mean = np.mean(features.rms)
+    zcr_mean = np.mean(features.zcr)
     return energy_mean, zcr_mean
 
-# Example usage
-audio_file = 'path_to_audio.wav'
-energy, zcr = speech_quality(audio_file)
-print(f"Energy: {energy}, Zero Crossing Rate: {zcr}")
+if __name__ == "__main__":
+    # Example usage
+    audio_file = 'path_to_audio.wav'
+    energy, zcr = speech_quality(audio_file)
+    print(f"Energy: {energy}, Zero Crossing Rate: {zcr}")
@@ -0,0 +1,128 @@
+import queue
+import numpy as np
+from vad import StreamingVAD, VoiceActivityDetector
+from audio_features import SPEECH_SAMPLE_RATE, AudioCapture, frame_lengths, zero_crossing_rate, to_mono_float, confidence_from_stats
+
+# Raised when the microphone stream stalls or reports an error
+class RecordingError(RuntimeError):
+    pass
+
+# Online version of calculate_confidence: RMS, ZCR and the energy max are updated chunk by chunk.
+# Frames are centered like AudioFeatures (edge padding at both ends), so once flush() has run
+# the score equals the batch score of the whole recording.
+class StreamingConfidence:
+    def __init__(self, samplerate=SPEECH_SAMPLE_RATE):
+        self.samplerate = samplerate
+        self.frame_length, self.hop_length = frame_lengths(samplerate)
+        self.pending = None  # None until the first sample, which is repeated as the leading pad
+        self.last_sample = 0.0
+        self.flushed = False
+        self.frame_count = 0
+        self.rms_sum = 0.0
+        self.rms_max = 0.0
+        self.zcr_sum = 0.0
+
+    # Function to consume a chunk and return the RMS of every frame it completed
+    def update(self, chunk):
+        chunk = to_mono_float(chunk)
+        if len(chunk) == 0:
+            return np.zeros(0, dtype=np.float32)
+        if self.pending is None:
+            self.pending = np.full(self.frame_length // 2, chunk[0], dtype=np.float32)
+        self.last_sample = float(chunk[-1])
+        return self._consume(np.concatenate([self.pending, chunk]))
+
+    # Function to pad the end of the recording and score the frames still pending
+    def flush(self):
+        if self.pending is None or self.flushed:
+            return np.zeros(0, dtype=np.float32)
+        self.flushed = True
+        return self._consume(np.concatenate([self.pending, np.full(self.frame_length // 2, self.last_sample, dtype=np.float32)]))
+
+    def _consume(self, samples):
+        if len(samples) < self.frame_length:
+            self.pending = samples
+            return np.zeros(0, dtype=np.float32)
+
+        frames = np.lib.stride_tricks.sliding_window_view(samples, self.frame_length)[::self.hop_length]
+        # Keep the samples the next frame still needs
+        self.pending = samples[len(frames) * self.hop_length:].copy()
+
+        rms = np.sqrt(np.einsum("ij,ij->i", frames, frames) / self.frame_length)
+        zcr = zero_crossing_rate(frames, self.samplerate)
+
+        self.frame_count += len(frames)
+        self.rms_sum += float(rms.sum())
+        self.rms_max = max(self.rms_max, float(rms.max()))
+        self.zcr_sum += float(zcr.sum())
+        return rms
+
+    # Confidence score of everything seen so far
+    @property
+    def score(self):
+        if self.frame_count == 0:
+            return 0
+        return confidence_from_stats(self.rms_sum / self.frame_count, self.rms_max, self.zcr_sum / self.frame_count)
+
+
+# Function to record from the microphone, scoring confidence online and stopping on sustained silence.
+# Samples go straight into one preallocated mono int16 buffer; the capture is a copy of its recorded part.
+# Raises RecordingError if no block arrives for stall_timeout seconds or the stream reports an error;
+# input overflows (blocks dropped because the reader fell behind) are counted and reported.
+def record_streaming(max_duration=30, samplerate=SPEECH_SAMPLE_RATE, silence_threshold=0.01, silence_seconds=2.0, blocksize=1024, on_chunk=None, stall_timeout=2.0):
+    import sounddevice as sd
+    chunks = queue.Queue()
+
+    def callback(indata, frames, time_info, status):
+        chunks.put((indata[:, 0].copy(), status))
+
+    confidence = StreamingConfidence(samplerate)
+    # Voice activity with hysteresis, so a single quiet block inside a word does not count as silence
+    # silence_threshold stays an absolute bound: frames quieter than it never count as speech for the stop
+    voice_activity = StreamingVAD(samplerate, VoiceActivityDetector(min_energy=silence_threshold ** 2), silence_energy=silence_threshold ** 2)
+    buffer = np.empty(int(max_duration * samplerate), dtype=np.int16)
+    position = 0
+    overflows = 0
+
+    with sd.InputStream(samplerate=samplerate, channels=1, dtype="int16", blocksize=blocksize, callback=callback):
+        while position < len(buffer):
+            try:
+                chunk, status = chunks.get(timeout=stall_timeout)
+            except queue.Empty:
+                raise RecordingError(f"No audio from the microphone for {stall_timeout} seconds")
+            if status:
+                if not status.input_overflow:
+                    raise RecordingError(f"Microphone stream error: {status}")
+                overflows += 1
+            chunk = chunk[:len(buffer) - position]
+            buffer[position:position + len(chunk)] = chunk
+            position += len(chunk)
+            samples = to_mono_float(chunk)
+            confidence.update(samples)
+            voice_activity.update(samples)
+            if on_chunk is not None:
+                on_chunk(samples, confidence.score)
+
+            # Only start counting silence once the candidate has said something
+            if voice_activity.heard_speech and voice_activity.trailing_silence >= silence_seconds:
+                break
+
+    if overflows:
+        print(f"Warning: microphone input overflowed {overflows} times; some audio was dropped.")
+    confidence.flush()
+    # Copy the recorded part so the unused rest of the preallocated buffer can be freed
+    return AudioCapture(buffer[:position].copy(), samplerate), confidence.score
+
+# Function to record an answer in streaming mode, returning the in-memory capture and its live confidence score.
+# When a filename is given the recording is also written to disk in the background.
+def record_audio_streaming(filename=None, max_duration=30, samplerate=SPEECH_SAMPLE_RATE):
+    print(f"Recording your answer (up to {max_duration} seconds, stops when you go quiet)...")
+    try:
+        capture, confidence_score = record_streaming(max_duration=max_duration, samplerate=samplerate)
+        if filename:
+            capture.save_async(filename)
+        print("Recording completed.")
+        return capture, confidence_score
+    except Exception as e:
+        print(f"Error during recording: {e}")
+        return None, None
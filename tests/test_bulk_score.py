@@ -0,0 +1,59 @@
+import csv
+from bulk_score import COLUMNS, already_scored, repair_journal
+
+# Function to write a journal the way main() does: header plus one row per audio path
+def write_journal(path, audio_paths, transcript="I led the team."):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        for audio_path in audio_paths:
+            writer.writerow({"audio_path": audio_path, "question_id": 1, "transcript": transcript, "total_seconds": 1.5})
+
+# Function to append a row to the journal the way a resumed run does
+def append_row(path, audio_path):
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        csv.DictWriter(f, fieldnames=COLUMNS).writerow({"audio_path": audio_path, "question_id": 2})
+
+def read_rows(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+def test_complete_journal_is_untouched(tmp_path):
+    path = tmp_path / "results.csv"
+    write_journal(path, ["a.wav", "b.wav"])
+    before = path.read_bytes()
+    repair_journal(path)
+    assert path.read_bytes() == before
+    assert already_scored(path) == {"a.wav", "b.wav"}
+
+def test_truncated_last_row_is_dropped_and_rescored(tmp_path):
+    path = tmp_path / "results.csv"
+    write_journal(path, ["a.wav", "b.wav"])
+    data = path.read_bytes()
+    # Crash in the middle of writing b.wav's row
+    path.write_bytes(data[:data.rindex(b"b.wav") + 20])
+    repair_journal(path)
+    assert already_scored(path) == {"a.wav"}
+    append_row(path, "b.wav")
+    rows = read_rows(path)
+    assert [row["audio_path"] for row in rows] == ["a.wav", "b.wav"]
+    assert all(None not in row for row in rows)
+
+def test_truncated_multiline_transcript_is_dropped(tmp_path):
+    path = tmp_path / "results.csv"
+    write_journal(path, ["a.wav", "b.wav"], transcript="First line.\nSecond line.")
+    data = path.read_bytes()
+    # Crash right after the newline inside b.wav's quoted transcript
+    path.write_bytes(data[:data.rindex(b"First line.\n") + len(b"First line.\n")])
+    repair_journal(path)
+    assert already_scored(path) == {"a.wav"}
+
+def test_truncated_header_leaves_an_empty_journal(tmp_path):
+    path = tmp_path / "results.csv"
+    path.write_text("audio_path,question_id,tran", encoding="utf-8")
+    repair_journal(path)
+    assert path.read_bytes() == b""
+
+def test_missing_journal_is_ignored(tmp_path):
+    repair_journal(tmp_path / "results.csv")
+    assert already_scored(tmp_path / "results.csv") == set()
@@ -0,0 +1,61 @@
+import pytest
+import transcription
+from transcription import GoogleBackend, LocalWhisperBackend, chunk_spans, get_backend
+
+SAMPLE_RATE = 16000
+
+# Function to check that the ownership intervals of the spans tile [0, inf) without gaps or overlaps
+def assert_owned_once(spans):
+    assert spans[0][2] == 0.0
+    assert spans[-1][3] == float("inf")
+    for (_, _, _, own_end), (_, _, own_start, _) in zip(spans, spans[1:]):
+        assert own_end == own_start
+
+def test_shorter_than_one_chunk():
+    spans = chunk_spans(5 * SAMPLE_RATE, SAMPLE_RATE, 30.0, 2.0)
+    assert spans == [(0, 5 * SAMPLE_RATE, 0.0, float("inf"))]
+
+def test_empty_signal_still_has_one_span():
+    assert chunk_spans(0, SAMPLE_RATE, 30.0, 2.0) == [(0, 0, 0.0, float("inf"))]
+
+def test_exact_multiple_of_the_step():
+    # 58 s = two 30 s chunks overlapping by 2 s; no third chunk made only of overlap
+    spans = chunk_spans(58 * SAMPLE_RATE, SAMPLE_RATE, 30.0, 2.0)
+    assert [(start, end) for start, end, _, _ in spans] == [(0, 30 * SAMPLE_RATE), (28 * SAMPLE_RATE, 58 * SAMPLE_RATE)]
+    assert_owned_once(spans)
+
+def test_overlapping_chunks_split_ownership_mid_overlap():
+    spans = chunk_spans(70 * SAMPLE_RATE, SAMPLE_RATE, 30.0, 2.0)
+    assert [(start, end) for start, end, _, _ in spans] == [
+        (0, 30 * SAMPLE_RATE), (28 * SAMPLE_RATE, 58 * SAMPLE_RATE), (56 * SAMPLE_RATE, 70 * SAMPLE_RATE),
+    ]
+    assert_owned_once(spans)
+    # Each boundary sits in the middle of the 2 s overlap
+    assert [own_end for _, _, _, own_end in spans[:-1]] == [29.0, 57.0]
+    # Every chunk covers the interval it owns
+    for start, end, own_start, own_end in spans:
+        assert start / SAMPLE_RATE <= own_start
+        assert min(own_end, 70.0) <= end / SAMPLE_RATE
+
+@pytest.fixture(autouse=True)
+def fresh_backends(monkeypatch):
+    monkeypatch.setattr(transcription, "_backends", {})
+    monkeypatch.delenv("STT_BACKEND", raising=False)
+
+def test_default_backend_is_google():
+    assert isinstance(get_backend(), GoogleBackend)
+
+def test_backend_from_environment(monkeypatch):
+    monkeypatch.setenv("STT_BACKEND", "local")
+    assert isinstance(get_backend(), LocalWhisperBackend)
+
+def test_explicit_name_overrides_environment(monkeypatch):
+    monkeypatch.setenv("STT_BACKEND", "local")
+    assert isinstance(get_backend("google"), GoogleBackend)
+
+def test_backend_is_created_once():
+    assert get_backend("local") is get_backend("local")
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        get_backend("nope")
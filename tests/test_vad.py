@@ -0,0 +1,88 @@
+import sys
+import threading
+import types
+import numpy as np
+import pytest
+from benchmark import synth_audio
+from vad import StreamingVAD, VoiceActivityDetector
+
+SAMPLE_RATE = 16000
+
+# Function to run the streaming detector over audio split into chunks of the given size
+def stream(audio, chunk_size, **kwargs):
+    vad = StreamingVAD(SAMPLE_RATE, **kwargs)
+    for start in range(0, len(audio), chunk_size):
+        vad.update(audio[start:start + chunk_size])
+    return vad
+
+@pytest.mark.parametrize("chunk_size", [512, 1024, 4000, 16000, 160000])
+def test_streaming_matches_batch(chunk_size):
+    audio = synth_audio("speech", 20)
+    batch = VoiceActivityDetector().analyze(audio, SAMPLE_RATE)
+    streamed = stream(audio, chunk_size).result()
+    assert batch.pause_count == 3
+    assert streamed.pause_count == batch.pause_count
+    assert streamed.total_pause == pytest.approx(batch.total_pause, abs=0.05)
+
+@pytest.mark.parametrize("noise_rms", [0.005, 0.01, 0.02])
+def test_batch_finds_pauses_in_noise(noise_rms):
+    rng = np.random.default_rng(1)
+    audio = synth_audio("speech", 20) + (noise_rms * rng.standard_normal(20 * SAMPLE_RATE)).astype(np.float32)
+    analysis = VoiceActivityDetector().analyze(audio, SAMPLE_RATE)
+    assert analysis.pause_count == 3
+    assert analysis.total_pause == pytest.approx(3.33, abs=0.2)
+
+def test_silent_start_does_not_collapse_the_floor():
+    audio = np.concatenate([np.zeros(SAMPLE_RATE, dtype=np.float32), synth_audio("speech", 20)])
+    batch = VoiceActivityDetector().analyze(audio, SAMPLE_RATE)
+    streamed = stream(audio, 1024).result()
+    assert batch.pause_count == streamed.pause_count == 3
+
+def test_click_does_not_reset_trailing_silence():
+    rng = np.random.default_rng(2)
+    noise = lambda seconds: (0.001 * rng.standard_normal(int(seconds * SAMPLE_RATE))).astype(np.float32)
+    t = np.arange(SAMPLE_RATE) / SAMPLE_RATE
+    tone = (0.3 * np.sin(2 * np.pi * 200 * t)).astype(np.float32)
+    click = 0.5 * tone[:int(0.05 * SAMPLE_RATE)]
+    vad = stream(np.concatenate([noise(0.5), tone, noise(1.0), click, noise(1.2)]), 1024)
+    assert vad.heard_speech
+    assert vad.trailing_silence == pytest.approx(2.25, abs=0.1)
+
+
+# Stand-in for the sounddevice module: InputStream feeds the given audio to the callback in blocks
+def fake_sounddevice(audio):
+    class Status:
+        input_overflow = False
+
+        def __bool__(self):
+            return False
+
+    class InputStream:
+        def __init__(self, samplerate, channels, dtype, blocksize, callback):
+            self.blocksize = blocksize
+            self.callback = callback
+
+        def feed(self):
+            pcm = (np.clip(audio, -1, 1) * 32767).astype(np.int16)[:, None]
+            for start in range(0, len(pcm), self.blocksize):
+                self.callback(pcm[start:start + self.blocksize], self.blocksize, None, Status())
+
+        def __enter__(self):
+            threading.Thread(target=self.feed, daemon=True).start()
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    return types.SimpleNamespace(InputStream=InputStream)
+
+@pytest.mark.parametrize("noise_rms", [0.002, 0.005, 0.007, 0.009])
+def test_recorder_stops_on_noisy_silence(monkeypatch, noise_rms):
+    from streaming_recorder import record_streaming
+    rng = np.random.default_rng(3)
+    speech = synth_audio("speech", 4)
+    silence = (noise_rms * rng.standard_normal(26 * SAMPLE_RATE)).astype(np.float32)
+    monkeypatch.setitem(sys.modules, "sounddevice", fake_sounddevice(np.concatenate([speech, silence])))
+    capture, _ = record_streaming(max_duration=30)
+    # 4 s of speech plus the 2 s silence window, well short of the 30 s limit
+    assert 5.5 <= capture.duration <= 7.0
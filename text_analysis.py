@@ -0,0 +1,101 @@
+import os
+import re
+import string
+import sys
+from collections import Counter
+from functools import lru_cache
+
+# Tokens are runs of letters and digits (the same words keyword_matcher.tokenize produces)
+# or runs of punctuation, which count towards the token total like NLTK's word_tokenize
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+|[^\sa-z0-9]+")
+WORD_START = frozenset(string.ascii_lowercase + string.digits)
+
+# Words that signal reasoning in an answer
+COGNITIVE_WORDS = frozenset(["analyze", "reason", "reflect", "understand", "think"])
+
+# Local NLTK data cache; NLTK_DATA and NLTK's default locations are searched after it
+NLTK_DATA_DIR = os.environ.get("NLTK_DATA_CACHE", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "nltk_data"))
+
+# Function to list the directories searched for NLTK data
+def nltk_data_dirs():
+    dirs = [NLTK_DATA_DIR] + os.environ.get("NLTK_DATA", "").split(os.pathsep)
+    dirs.append(os.path.expanduser("~/nltk_data"))
+    dirs += [os.path.join(sys.prefix, name) for name in ("nltk_data", os.path.join("share", "nltk_data"), os.path.join("lib", "nltk_data"))]
+    dirs += ["/usr/share/nltk_data", "/usr/local/share/nltk_data", "/usr/lib/nltk_data", "/usr/local/lib/nltk_data"]
+    return [directory for directory in dirs if directory]
+
+# Function to find an unpacked NLTK data file without importing nltk
+def find_nltk_file(relative_path):
+    for directory in nltk_data_dirs():
+        path = os.path.join(directory, relative_path)
+        if os.path.exists(path):
+            return path
+    return None
+
+# Function to load the English stopword list once per process, straight from the NLTK data file
+@lru_cache(maxsize=None)
+def stopword_lexicon():
+    relative_path = os.path.join("corpora", "stopwords", "english")
+    path = find_nltk_file(relative_path)
+    if path is None:
+        # Fetched once into the local cache on first use, never at import time
+        import nltk
+        nltk.download("stopwords", download_dir=NLTK_DATA_DIR, quiet=True)
+        path = find_nltk_file(relative_path)
+        if path is None:
+            raise LookupError(f"NLTK stopwords not found; run: python -m nltk.downloader -d {NLTK_DATA_DIR} stopwords")
+    with open(path, encoding="utf-8") as f:
+        return frozenset(line.strip() for line in f if line.strip())
+
+# Lexical analysis of one response. The text is lowercased and tokenised once, and a single
+# pass over the tokens fills the stopword mask, the content word counts and the cognitive
+# word count that every lexical analyzer reads.
+class TextAnalysis:
+    def __init__(self, text):
+        self.text = text
+        self.tokens = TOKEN_PATTERN.findall(text.lower())
+        self.words = []
+        self.stopword_mask = []  # One flag per word
+        self.content_counts = Counter()
+        self.cognitive_count = 0
+
+        stop_words = stopword_lexicon()
+        for token in self.tokens:
+            if token[0] not in WORD_START:
+                continue
+            self.words.append(token)
+            is_stopword = token in stop_words
+            self.stopword_mask.append(is_stopword)
+            if not is_stopword:
+                self.content_counts[token] += 1
+            if token in COGNITIVE_WORDS:
+                self.cognitive_count += 1
+
+    # Number of words that are not stopwords
+    @property
+    def content_word_count(self):
+        return len(self.words) - sum(self.stopword_mask)
+
+    # Function to compute lexical diversity (content words per distinct content word) and the most common content words
+    def lexical_diversity(self, top=5):
+        distinct = len(self.content_counts)
+        score = self.content_word_count / distinct if distinct else 0.0
+        return score, self.content_counts.most_common(top)
+
+    # Function to compute the proportion of tokens that are cognitive words
+    def cognitive_complexity(self):
+        return self.cognitive_count / len(self.tokens) if self.tokens else 0.0
+
+    # Function to list the most frequent content words
+    def word_frequencies(self, top=None):
+        return self.content_counts.most_common(top)
+
+    # Function to score the response against one question's keywords
+    def keyword_score(self, matcher, question_id):
+        return matcher.score_tokens(question_id, self.words)
+
+
+# Function to get the analysis of a text; analyzers scoring the same response in one process share it
+@lru_cache(maxsize=256)
+def analyze_text(text):
+    return TextAnalysis(text)
@@ -0,0 +1,168 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from audio_features import AudioCapture, to_mono_float
+from model_registry import registry
+
+# Sample rate expected by the local speech-to-text engine
+ASR_SAMPLE_RATE = 16000
+
+# Raised when a backend cannot produce a transcript (network error, missing model, ...)
+class TranscriptionError(Exception):
+    pass
+
+# Result of a transcription: the text plus (word, start_seconds, end_seconds) tuples when the backend provides them
+class Transcript:
+    def __init__(self, text, words=None):
+        self.text = text
+        self.words = words or []
+
+    # Short representation for logs
+    def __repr__(self):
+        return f"Transcript({self.text!r}, {len(self.words)} words)"
+
+# Interface every speech-to-text backend implements
+class TranscriptionBackend:
+    name = None
+
+    # Function to transcribe mono float samples in [-1, 1] at the given sample rate
+    def transcribe(self, samples, samplerate):
+        raise NotImplementedError
+
+    # Function to check that the backend can run (e.g. its model loads), raising TranscriptionError if not
+    def check(self):
+        pass
+
+
+# Google Web Speech API through speech_recognition (needs network access, no word timings)
+class GoogleBackend(TranscriptionBackend):
+    name = "google"
+
+    def transcribe(self, samples, samplerate):
+        import speech_recognition as sr
+        pcm = (np.clip(samples, -1, 1) * 32767).astype(np.int16).tobytes()
+        recognizer = sr.Recognizer()
+        try:
+            return Transcript(recognizer.recognize_google(sr.AudioData(pcm, samplerate, 2)))
+        except sr.UnknownValueError:
+            return Transcript("")
+        except sr.RequestError as e:
+            raise TranscriptionError(f"Google speech recognition request failed: {e}") from e
+
+
+# Local CPU engine (faster-whisper): long answers are decoded as overlapping chunks in parallel
+class LocalWhisperBackend(TranscriptionBackend):
+    name = "local"
+
+    def __init__(self, chunk_seconds=30.0, overlap_seconds=2.0, workers=None):
+        self.chunk_seconds = chunk_seconds
+        self.overlap_seconds = overlap_seconds
+        self.workers = workers or max(1, min(4, (os.cpu_count() or 1) // 2))
+
+    def transcribe(self, samples, samplerate):
+        try:
+            samples = resample(samples, samplerate, ASR_SAMPLE_RATE)
+            model = registry.get("whisper")
+        except Exception as e:
+            raise TranscriptionError(f"Local speech recognition is unavailable: {e}") from e
+        spans = chunk_spans(len(samples), ASR_SAMPLE_RATE, self.chunk_seconds, self.overlap_seconds)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            decoded = list(pool.map(lambda span: self.decode_chunk(model, samples, span), spans))
+
+        # Each word is kept only by the chunk that owns its midpoint, so overlaps are not duplicated
+        words = [word for chunk_words in decoded for word in chunk_words]
+        return Transcript(" ".join(word for word, _, _ in words), words)
+
+    def check(self):
+        try:
+            registry.get("whisper")
+        except Exception as e:
+            raise TranscriptionError(f"Local speech recognition is unavailable: {e}") from e
+
+    # Function to decode one chunk and return the words it owns, in absolute time
+    def decode_chunk(self, model, samples, span):
+        start, end, own_start, own_end = span
+        offset = start / ASR_SAMPLE_RATE
+        try:
+            segments, _ = model.transcribe(samples[start:end], language="en", beam_size=1, word_timestamps=True)
+            words = []
+            for segment in segments:
+                for word in segment.words:
+                    word_start, word_end = word.start + offset, word.end + offset
+                    if own_start <= (word_start + word_end) / 2 < own_end:
+                        words.append((word.word.strip(), round(word_start, 3), round(word_end, 3)))
+            return words
+        except Exception as e:
+            raise TranscriptionError(f"Local speech recognition failed: {e}") from e
+
+
+# Function to split a signal into overlapping chunks; returns (start, end, own_start_s, own_end_s) per chunk
+def chunk_spans(num_samples, samplerate, chunk_seconds, overlap_seconds):
+    chunk = int(chunk_seconds * samplerate)
+    step = chunk - int(overlap_seconds * samplerate)
+    starts = list(range(0, max(num_samples - int(overlap_seconds * samplerate), 1), step))
+    spans = []
+    for i, start in enumerate(starts):
+        end = min(start + chunk, num_samples)
+        # Ownership boundaries sit in the middle of each overlap
+        own_start = 0.0 if i == 0 else (start + (starts[i - 1] + chunk - start) / 2) / samplerate
+        own_end = float("inf") if i == len(starts) - 1 else (starts[i + 1] + start + chunk) / 2 / samplerate
+        spans.append((start, end, own_start, own_end))
+    return spans
+
+# Function to resample mono audio to the ASR sample rate
+def resample(samples, samplerate, target_rate):
+    if samplerate == target_rate:
+        return samples
+    from math import gcd
+    from scipy.signal import resample_poly
+    divisor = gcd(int(samplerate), int(target_rate))
+    return resample_poly(samples, target_rate // divisor, int(samplerate) // divisor).astype(np.float32)
+
+# Loader for the local engine's model, registered so it is loaded once per process
+def load_whisper_model():
+    from faster_whisper import WhisperModel
+    model_size = os.environ.get("WHISPER_MODEL", "base.en")
+    return WhisperModel(model_size, device="cpu", compute_type="int8", num_workers=max(1, min(4, (os.cpu_count() or 1) // 2)))
+
+registry.register("whisper", load_whisper_model)
+
+# Available backends by name
+BACKENDS = {
+    GoogleBackend.name: GoogleBackend,
+    LocalWhisperBackend.name: LocalWhisperBackend,
+}
+_backends = {}
+
+# Function to get the configured backend (STT_BACKEND=google|local, Google by default)
+def get_backend(name=None):
+    name = name or os.environ.get("STT_BACKEND", "google")
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown transcription backend: {name} (choose from {', '.join(BACKENDS)})")
+    if name not in _backends:
+        _backends[name] = BACKENDS[name]()
+    return _backends[name]
+
+# Function to transcribe mono or multi-channel samples
+def transcribe(samples, samplerate, backend=None):
+    return get_backend(backend).transcribe(to_mono_float(samples), samplerate)
+
+# Function to transcribe an in-memory AudioCapture without a temp-file round-trip
+def transcribe_capture(capture, backend=None):
+    return transcribe(capture.samples, capture.samplerate, backend)
+
+# Function to transcribe either an AudioCapture or a WAV file path
+def transcribe_source(audio, backend=None):
+    if isinstance(audio, AudioCapture):
+        return transcribe_capture(audio, backend)
+    return transcribe_file(audio, backend)
+
+# Function to transcribe a WAV file
+def transcribe_file(audio_path, backend=None):
+    import soundfile as sf
+    samples, samplerate = sf.read(audio_path, dtype="float32", always_2d=True)
+    return transcribe(samples, samplerate, backend)
+
+# Function to transcribe a speech_recognition AudioData captured from the microphone
+def transcribe_audio_data(audio, backend=None):
+    return transcribe_capture(AudioCapture.from_audio_data(audio, audio.sample_rate), backend)
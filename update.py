@@ -1,125 +1,81 @@
-import os
-import sounddevice as sd
-import soundfile as sf
-import librosa
-import numpy as np
-from sentence_transformers import SentenceTransformer, util
-import time
-import speech_recognition as sr
+from audio_store import audio_store, new_session_id
+from audio_features import AudioCapture, SPEECH_SAMPLE_RATE, calculate_confidence
+from streaming_recorder import record_audio_streaming
+from transcription import transcribe_source, TranscriptionError
+from question_bank import load_question_bank
+from reference_index import infer_question
+from sentence_similarity import load_similarity_model, calculate_similarity
 
-# Load the Hugging Face model for semantic similarity
-model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
+# HR interview questions, loaded from the question bank file
+questions = load_question_bank().questions
 
-# Predefined data: HR interview questions and example answers
-questions = {
-    1: "Tell me about yourself.",
-    2: "What are your strengths?",
-    3: "Why do you want to work here?"
-}
-
-# Predefined answers: multiple examples for each question
-predefined_answers = {
-    1: [
-        "I am a software developer with 5 years of experience, passionate about creating innovative solutions.",
-        "I have a background in finance, with strong analytical skills and a drive to learn new technologies.",
-        "I am a recent graduate in marketing, eager to apply my knowledge in a dynamic environment."
-    ],
-    2: [
-        "My strengths include excellent communication, leadership abilities, and being a proactive team player.",
-        "I excel in problem-solving, adapting to new situations, and maintaining a positive attitude under pressure.",
-        "I am highly organized, detail-oriented, and skilled at managing multiple projects simultaneously."
-    ],
-    3: [
-        "I admire this company's mission to drive innovation and would love to contribute to that vision.",
-        "The opportunity to grow in a company with a strong culture and values aligns with my career goals.",
-        "I am drawn to this company's emphasis on employee development and impactful projects."
-    ]
-}
-
-# Function to calculate semantic similarity score
-def calculate_similarity(predefined_answers, user_answer):
-    predefined_embeddings = model.encode(predefined_answers, convert_to_tensor=True)
-    user_embedding = model.encode(user_answer, convert_to_tensor=True)
-    similarity_scores = util.pytorch_cos_sim(user_embedding, predefined_embeddings)
-    return round(similarity_scores.max().item() * 100, 2)
-
-# Function to calculate confidence score using Librosa
-def calculate_confidence(audio_path):
-    try:
-        # Load the audio file using librosa
-        y, sr = librosa.load(audio_path, sr=None)
-        
-        # Compute the energy (Root Mean Square energy)
-        energy = librosa.feature.rms(y=y)
-        energy_mean = np.mean(energy)
-        
-        # Compute Zero-Crossing Rate (a rough indication of speech clarity)
-        zcr = librosa.feature.zero_crossing_rate(y=y)
-        zcr_mean = np.mean(zcr)
-        
-        # Normalize energy and ZCR mean
-        energy_max = np.max(energy)
-        energy_scaled = (energy_mean / energy_max) if energy_max != 0 else energy_mean
-        
-        # Dynamic confidence score scaling using energy and ZCR
-        confidence_score = min(max((energy_scaled + zcr_mean) * 100, 0), 100)
-        
-        return round(confidence_score, 2)
-    
-    except Exception as e:
-        print(f"Error extracting confidence: {e}")
-        return 0
+# Function to find which question of the bank an answer addresses, as (question id, similarity %)
+def infer_question_id(user_answer):
+    model, reference_embeddings = load_similarity_model()
+    return infer_question(model, reference_embeddings, user_answer)
 
 # Function to capture audio using sounddevice
-def record_audio(filename, duration=10, samplerate=44100):
-    print("Recording your answer for 30 seconds...")
+def record_audio(filename=None, duration=10, samplerate=SPEECH_SAMPLE_RATE):
+    print(f"Recording your answer for {duration} seconds...")
     try:
-        # Record audio with sounddevice (ensure int16 format for PCM WAV)
-        data = sd.rec(int(samplerate * duration), samplerate=samplerate, channels=2, dtype='int16', blocking=True)
-        # Save the audio to a WAV file in PCM format
-        sf.write(filename, data, samplerate, format='WAV')
-        print("Recording completed and saved.")
+        import sounddevice as sd
+        # Record mono int16 speech-band audio straight into memory
+        data = sd.rec(int(samplerate * duration), samplerate=samplerate, channels=1, dtype='int16', blocking=True)
+        capture = AudioCapture(data[:, 0], samplerate)
+        # Saving to disk is optional and happens in the background
+        if filename:
+            capture.save_async(filename)
+        print("Recording completed.")
+        return capture
     except Exception as e:
         print(f"Error during recording: {e}")
+        return None
 
-# Function to transcribe audio
-def transcribe_audio(filename):
-    recognizer = sr.Recognizer()
+# Function to transcribe audio with the configured speech-to-text backend
+def transcribe_audio(audio):
     try:
-        with sr.AudioFile(filename) as source:
-            audio = recognizer.record(source)
-            return recognizer.recognize_google(audio)
-    except sr.UnknownValueError:
-        print("Sorry, I couldn't understand your answer. Please try again.")
-        return ""
-    except sr.RequestError as e:
+        text = transcribe_source(audio).text
+    except TranscriptionError as e:
         print(f"Error with the speech recognition service: {e}")
         return ""
+    if not text:
+        print("Sorry, I couldn't understand your answer. Please try again.")
+    return text
 
 # Function to capture and process audio input
-def get_audio_input():
-    audio_path = "user_response.wav"
-    record_audio(audio_path, duration=10)
-    text = transcribe_audio(audio_path)
-    return text, audio_path
+def get_audio_input(streaming=True, save_path=None):
+    confidence_score = None
+    if streaming:
+        # Confidence is scored while recording, so it is ready as soon as the candidate stops
+        audio, confidence_score = record_audio_streaming(save_path, max_duration=30)
+    else:
+        audio = record_audio(save_path, duration=10)
+    if audio is None:
+        return "", None, None
+    # The in-memory capture goes straight to ASR and the feature extractors
+    text = transcribe_audio(audio)
+    return text, audio, confidence_score
 
 # Main interview process
 def interview():
     print("Welcome to the HR Interview Simulation!\n")
+    session_id = new_session_id()
     scores = {}
     confidence_scores = {}
 
     for question_id, question in questions.items():
         print(f"Question {question_id}: {question}")
-        user_answer, audio_path = get_audio_input()
+        user_answer, audio, confidence_score = get_audio_input()
 
         if not user_answer:
             print("No valid answer received. Moving to the next question...\n")
             continue
 
-        predefined_set = predefined_answers[question_id]
-        similarity_score = calculate_similarity(predefined_set, user_answer)
-        confidence_score = calculate_confidence(audio_path)
+        # Responses are kept per session, so concurrent interviews never overwrite each other
+        audio_store.put(session_id, question_id, audio)
+        similarity_score = calculate_similarity(question_id, user_answer)
+        if confidence_score is None:
+            confidence_score = calculate_confidence(audio)
         scores[question_id] = similarity_score
         confidence_scores[question_id] = confidence_score
 
@@ -131,6 +87,7 @@ def interview():
         print(f"Q{question_id}: {questions[question_id]}")
         print(f" - Similarity Score: {scores.get(question_id, 'N/A')}%")
         print(f" - Confidence Score: {confidence_scores.get(question_id, 'N/A')}%")
+    audio_store.drop_session(session_id)
 
 if __name__ == "__main__":
     interview()
@@ -0,0 +1,288 @@
+import numpy as np
+from audio_features import AudioFeatures, to_mono_float
+
+# Voice activity frames: 25 ms windows every 10 ms
+FRAME_SECONDS = 0.025
+HOP_SECONDS = 0.010
+
+# Function to compute the energy and zero-crossing rate of every full frame, as strided views (no per-frame loop)
+def frame_energy_zcr(samples, frame_length, hop_length):
+    if len(samples) < frame_length:
+        return np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.float32)
+    frames = np.lib.stride_tricks.sliding_window_view(samples, frame_length)[::hop_length]
+    energy = np.einsum("ij,ij->i", frames, frames) / frame_length
+    signs = np.signbit(frames)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / frame_length
+    return energy.astype(np.float32), zcr.astype(np.float32)
+
+# Function to take the minimum frame energy of every window of `window` frames (the last window may be partial)
+def window_minima(energy, window):
+    full = len(energy) // window * window
+    minima = energy[:full].reshape(-1, window).min(axis=1)
+    if full < len(energy):
+        minima = np.append(minima, energy[full:].min())
+    return minima
+
+# Function to run-length encode a boolean mask into (values, lengths)
+def run_lengths(mask):
+    mask = np.asarray(mask, dtype=bool)
+    if len(mask) == 0:
+        return np.zeros(0, dtype=bool), np.zeros(0, dtype=np.int64)
+    starts = np.flatnonzero(np.concatenate([[True], mask[1:] != mask[:-1]]))
+    lengths = np.diff(np.concatenate([starts, [len(mask)]]))
+    return mask[starts], lengths
+
+# Function to merge neighbouring runs with the same value (after some runs were flipped)
+def merge_runs(values, lengths):
+    if len(values) == 0:
+        return values, lengths
+    starts = np.flatnonzero(np.concatenate([[True], values[1:] != values[:-1]]))
+    return values[starts], np.add.reduceat(lengths, starts)
+
+# Function to apply hysteresis: a frame turns speech on a strong frame and stays speech until a frame
+# drops below the weak threshold. The last decisive frame is found by a running maximum (forward fill).
+def hysteresis(strong, weak, initial=False):
+    # 1 = switch on, 0 = switch off, -1 = keep the previous state
+    events = np.where(strong, 1, np.where(weak, -1, 0))
+    decisive = np.where(events >= 0, np.arange(len(events)), -1)
+    last = np.maximum.accumulate(decisive) if len(decisive) else decisive
+    state = np.where(last >= 0, events[np.maximum(last, 0)] == 1, initial)
+    return state, bool(state[-1]) if len(state) else initial
+
+# Function to smooth speech/silence runs: pauses shorter than min_pause_frames between speech are bridged,
+# then speech bursts shorter than min_speech_frames are dropped (clicks, breaths)
+def smooth_runs(values, lengths, min_pause_frames, min_speech_frames):
+    values = values.copy()
+    interior = np.zeros(len(values), dtype=bool)
+    interior[1:-1] = True
+    values[~values & interior & (lengths < min_pause_frames)] = True
+    values, lengths = merge_runs(values, lengths)
+    values[values & (lengths < min_speech_frames)] = False
+    return merge_runs(values, lengths)
+
+# Pause segmentation of one recording; only silences between the first and last speech count as pauses
+class PauseAnalysis:
+    def __init__(self, values, lengths, hop_seconds, duration, word_count=None):
+        ends = np.cumsum(lengths)
+        starts = ends - lengths
+        speech = np.flatnonzero(values)
+        self.duration = duration
+        self.speech_time = float(lengths[values].sum() * hop_seconds)
+        if len(speech):
+            first, last = speech[0], speech[-1]
+            pauses = np.flatnonzero(~values[first:last + 1]) + first
+            self.speech_start = float(starts[first] * hop_seconds)
+            self.speech_end = float(ends[last] * hop_seconds)
+        else:
+            pauses = np.zeros(0, dtype=np.int64)
+            self.speech_start = self.speech_end = 0.0
+        self.pause_segments = [(float(starts[i] * hop_seconds), float(ends[i] * hop_seconds)) for i in pauses]
+        pause_lengths = lengths[pauses] * hop_seconds
+        self.pause_count = len(pauses)
+        self.total_pause = float(pause_lengths.sum())
+        self.longest_pause = float(pause_lengths.max()) if len(pauses) else 0.0
+        self.word_count = word_count
+
+    # Words per minute over the spoken span (first to last speech, pauses included)
+    @property
+    def speaking_rate(self):
+        span = self.speech_end - self.speech_start
+        if not self.word_count or span <= 0:
+            return None
+        return self.word_count / span * 60
+
+    # Words per minute of actual speech (pauses excluded)
+    @property
+    def articulation_rate(self):
+        if not self.word_count or self.speech_time <= 0:
+            return None
+        return self.word_count / self.speech_time * 60
+
+    # Function to summarise the analysis as plain numbers
+    def summary(self):
+        return {
+            "total_pause": round(self.total_pause, 2),
+            "longest_pause": round(self.longest_pause, 2),
+            "pause_count": self.pause_count,
+            "speech_time": round(self.speech_time, 2),
+            "speaking_rate": None if self.speaking_rate is None else round(self.speaking_rate, 1),
+            "articulation_rate": None if self.articulation_rate is None else round(self.articulation_rate, 1),
+        }
+
+
+# Energy/ZCR voice activity detector with hysteresis and minimum-duration smoothing.
+# Thresholds are in dB above the noise floor. The floor is estimated by minimum statistics:
+# the quietest frame of every `noise_window` seconds is close to the background noise even in
+# an answer without long silences (the gaps between syllables reach it), and a low percentile
+# of those minima is the floor. Windows of digital silence are ignored, so a muted start does
+# not drag the floor below the real noise.
+# Quiet frames with a high zero-crossing rate (fricatives like "s" and "f") count as weak speech.
+class VoiceActivityDetector:
+    def __init__(self, high_db=9.0, low_db=4.0, zcr_threshold=0.25, min_energy=1e-5,
+                 min_pause=0.25, min_speech=0.1, frame_seconds=FRAME_SECONDS, hop_seconds=HOP_SECONDS,
+                 noise_window=1.0, noise_percentile=20):
+        self.high_db = high_db
+        self.low_db = low_db
+        self.zcr_threshold = zcr_threshold
+        self.min_energy = min_energy
+        self.min_pause = min_pause
+        self.min_speech = min_speech
+        self.frame_seconds = frame_seconds
+        self.hop_seconds = hop_seconds
+        self.noise_window = noise_window
+        self.noise_percentile = noise_percentile
+
+    # Number of frames in one noise estimation window
+    @property
+    def noise_window_frames(self):
+        return max(1, int(round(self.noise_window / self.hop_seconds)))
+
+    # Function to estimate the noise floor from per-window energy minima
+    def floor_from_minima(self, minima):
+        minima = np.asarray(minima, dtype=np.float64)
+        # Digital silence (a muted or zero-padded stretch) says nothing about the background noise
+        audible = minima[minima >= self.min_energy / 1000]
+        if len(audible) == 0:
+            return self.min_energy / 10
+        return max(float(np.percentile(audible, self.noise_percentile)), self.min_energy / 10)
+
+    # Function to estimate the noise floor of a set of frame energies
+    def noise_floor(self, energy):
+        if len(energy) == 0:
+            return self.min_energy
+        return self.floor_from_minima(window_minima(energy, self.noise_window_frames))
+
+    # Function to derive the strong and weak masks from frame energy and ZCR
+    def classify(self, energy, zcr, floor):
+        high = max(floor * 10 ** (self.high_db / 10), self.min_energy)
+        low = max(floor * 10 ** (self.low_db / 10), self.min_energy / 2)
+        strong = energy >= high
+        weak = (energy >= low) | ((zcr >= self.zcr_threshold) & (energy >= 2 * floor))
+        return strong, weak
+
+    # Function to segment speech and pauses in a recording (path, AudioCapture, AudioFeatures or raw samples)
+    def analyze(self, audio, samplerate=None, word_count=None):
+        if samplerate is None:
+            features = AudioFeatures.from_source(audio)
+            samples, samplerate = features.y, features.sr
+        else:
+            samples = to_mono_float(audio)
+        frame_length = int(round(self.frame_seconds * samplerate))
+        hop_length = int(round(self.hop_seconds * samplerate))
+        energy, zcr = frame_energy_zcr(samples, frame_length, hop_length)
+        strong, weak = self.classify(energy, zcr, self.noise_floor(energy))
+        speech, _ = hysteresis(strong, weak)
+        values, lengths = run_lengths(speech)
+        values, lengths = smooth_runs(values, lengths, self.min_pause / self.hop_seconds, self.min_speech / self.hop_seconds)
+        return PauseAnalysis(values, lengths, self.hop_seconds, len(samples) / samplerate, word_count)
+
+
+# Voice activity detector for audio arriving in chunks. Each chunk is framed and classified in
+# one vectorised step; hysteresis state and the partial frame carry over between chunks. The
+# noise floor uses the same window minima as the batch detector, collected over everything seen
+# so far, so it settles on the batch value whatever the chunk size.
+# Frames below `silence_energy` never end the trailing silence, whatever the detector decides;
+# the recorder uses it as an absolute bound for its silence stop.
+class StreamingVAD:
+    def __init__(self, samplerate, detector=None, silence_energy=0.0):
+        self.detector = detector or VoiceActivityDetector()
+        self.samplerate = samplerate
+        self.frame_length = int(round(self.detector.frame_seconds * samplerate))
+        self.hop_length = int(round(self.detector.hop_seconds * samplerate))
+        self.silence_energy = silence_energy
+        self.pending = np.zeros(0, dtype=np.float32)
+        self.floor = None
+        self.noise_minima = []  # Energy minimum of every completed noise window
+        self.window_min = np.inf  # Minimum of the window in progress
+        self.window_frames = 0
+        self.in_speech = False
+        self.samples_seen = 0
+        self.values = []
+        self.lengths = []
+        self.heard_speech = False
+        self.trailing_silence_frames = 0
+        self.speech_run_frames = 0  # Length of the speech run still in progress
+        self.min_speech_frames = self.detector.min_speech / self.detector.hop_seconds
+
+    # Function to consume a chunk and return the speech flag of every frame it completed
+    def update(self, chunk):
+        chunk = to_mono_float(chunk)
+        self.samples_seen += len(chunk)
+        samples = np.concatenate([self.pending, chunk])
+        energy, zcr = frame_energy_zcr(samples, self.frame_length, self.hop_length)
+        self.pending = samples[len(energy) * self.hop_length:].copy()
+        if len(energy) == 0:
+            return np.zeros(0, dtype=bool)
+
+        self._track_noise(energy)
+        current = self.noise_minima + ([self.window_min] if self.window_frames else [])
+        self.floor = self.detector.floor_from_minima(current)
+        strong, weak = self.detector.classify(energy, zcr, self.floor)
+        speech, self.in_speech = hysteresis(strong, weak, self.in_speech)
+
+        self._track_silence(speech & (energy >= self.silence_energy))
+
+        values, lengths = run_lengths(speech)
+        # Extend the last run when the chunk continues it
+        if self.values and values[0] == self.values[-1]:
+            self.lengths[-1] += int(lengths[0])
+            values, lengths = values[1:], lengths[1:]
+        self.values.extend(bool(value) for value in values)
+        self.lengths.extend(int(length) for length in lengths)
+        return speech
+
+    # Function to add a chunk's frame energies to the noise windows
+    def _track_noise(self, energy):
+        window = self.detector.noise_window_frames
+        start = 0
+        if self.window_frames:
+            # Finish the window left open by the previous chunk
+            start = min(window - self.window_frames, len(energy))
+            self.window_min = min(self.window_min, float(energy[:start].min()))
+            self.window_frames += start
+            if self.window_frames == window:
+                self.noise_minima.append(self.window_min)
+                self.window_min, self.window_frames = np.inf, 0
+        rest = energy[start:]
+        full = len(rest) // window * window
+        self.noise_minima.extend(float(value) for value in rest[:full].reshape(-1, window).min(axis=1))
+        if full < len(rest):
+            self.window_min, self.window_frames = float(rest[full:].min()), len(rest) - full
+
+    # Function to update the trailing silence from a chunk's speech flags
+    def _track_silence(self, speech):
+        values, lengths = run_lengths(speech)
+        # Silence only ends on a speech run long enough to survive the min_speech rule, so a click
+        # does not reset the silence count (a chunk holds few runs, so this loop is short)
+        for value, length in zip(values, lengths):
+            if not value:
+                self.speech_run_frames = 0
+                self.trailing_silence_frames += int(length)
+                continue
+            self.speech_run_frames += int(length)
+            if self.speech_run_frames >= self.min_speech_frames:
+                self.heard_speech = True
+                self.trailing_silence_frames = 0
+            else:
+                self.trailing_silence_frames += int(length)
+
+    # Seconds of silence since the last speech that lasted at least min_speech
+    @property
+    def trailing_silence(self):
+        return self.trailing_silence_frames * self.detector.hop_seconds
+
+    # Function to segment everything seen so far
+    def result(self, word_count=None):
+        values = np.array(self.values, dtype=bool)
+        lengths = np.array(self.lengths, dtype=np.int64)
+        detector = self.detector
+        values, lengths = smooth_runs(values, lengths, detector.min_pause / detector.hop_seconds, detector.min_speech / detector.hop_seconds)
+        return PauseAnalysis(values, lengths, detector.hop_seconds, self.samples_seen / self.samplerate, word_count)
+
+
+# Detector with the default settings, shared by the analyzers
+default_detector = VoiceActivityDetector()
+
+# Function to analyze the pauses of a recording with the default detector
+def analyze_pauses(audio, word_count=None):
+    return default_detector.analyze(audio, word_count=word_count)